@@ -1,4 +1,6 @@
 import os
+import time
+from functools import lru_cache
 
 from fastapi import Depends, HTTPException, status, Request
 
@@ -8,7 +10,10 @@ from src.notifications import EmailSenderInterface, EmailSender
 from src.security.interfaces import JWTAuthManagerInterface
 from src.security.token_manager import JWTAuthManager
 
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from src.database import get_db
 from src.database.models.accounts import UserModel, UserGroupEnum
@@ -28,11 +33,9 @@ def get_jwt_auth_manager(
     )
 
 
-async def get_current_user(
-    request: Request,
-    jwt_manager=Depends(get_jwt_auth_manager),
-    db=Depends(get_db),
-) -> UserModel:
+def get_access_token_payload(
+    request: Request, jwt_manager: JWTAuthManagerInterface
+) -> dict:
     auth_header = request.headers.get("Authorization")
     if not auth_header:
         raise HTTPException(
@@ -46,8 +49,7 @@ async def get_current_user(
         )
     token = auth_header.split(" ")[1]
     try:
-        payload = jwt_manager.decode_access_token(token)
-        user_id = payload.get("user_id")
+        return jwt_manager.decode_access_token(token)
     except Exception as e:
         if "expired" in str(e).lower():
             raise HTTPException(
@@ -56,7 +58,15 @@ async def get_current_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
-    user = await db.get(UserModel, user_id)
+
+
+async def get_current_user(
+    request: Request,
+    jwt_manager=Depends(get_jwt_auth_manager),
+    db=Depends(get_db),
+) -> UserModel:
+    payload = get_access_token_payload(request, jwt_manager)
+    user = await db.get(UserModel, payload.get("user_id"))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
@@ -95,14 +105,91 @@ def get_accounts_email_notificator(
     )
 
 
+@lru_cache
+def _create_redis_client(redis_url: str) -> Redis:
+    return Redis.from_url(redis_url, decode_responses=True)
+
+
+def get_redis_client(
+    settings: BaseAppSettings = Depends(get_settings),
+) -> Redis:
+    """
+    Retrieve the shared asynchronous Redis client used for caching.
+
+    The client (and its connection pool) is created once per Redis URL and reused across requests.
+
+    Args:
+        settings (BaseAppSettings, optional): The application settings,
+        provided via dependency injection from `get_settings`.
+
+    Returns:
+        Redis: An asyncio Redis client connected to `settings.REDIS_URL`.
+    """
+    return _create_redis_client(settings.REDIS_URL)
+
+
+# Upper bound on how long an admin decision is trusted without re-reading the user.
+ADMIN_CHECK_CACHE_TTL = 60
+
+
+def admin_check_cache_key(user_id: int) -> str:
+    return f"admin:{user_id}"
+
+
+async def invalidate_cached_admin_check(redis: Redis, user_id: int) -> None:
+    try:
+        await redis.delete(admin_check_cache_key(user_id))
+    except RedisError:
+        pass
+
+
 async def get_current_admin(
-    current_user: UserModel = Depends(get_current_user),
+    request: Request,
+    jwt_manager=Depends(get_jwt_auth_manager),
+    db=Depends(get_db),
+    redis: Redis = Depends(get_redis_client),
 ) -> UserModel:
-    if not current_user.has_group(UserGroupEnum.ADMIN):
+    """
+    Ensure the request is made by an active admin.
+
+    The admin decision is cached in Redis for at most `ADMIN_CHECK_CACHE_TTL` seconds
+    (never beyond the access token's lifetime), so repeated admin requests skip the user
+    lookup. Routes that change a user's group or activation state drop the entry through
+    `invalidate_cached_admin_check`.
+
+    On a cache hit the returned `UserModel` is a transient, id-only placeholder: no other
+    attribute is loaded, so callers that need more than `id` must fetch the user.
+    """
+    payload = get_access_token_payload(request, jwt_manager)
+    user_id = payload.get("user_id")
+    cache_key = admin_check_cache_key(user_id)
+
+    try:
+        cached = await redis.get(cache_key)
+    except RedisError:
+        cached = None
+
+    if cached is not None:
+        user = UserModel(id=user_id)
+        is_admin = cached == "1"
+    else:
+        user = await db.get(UserModel, user_id, options=[joinedload(UserModel.group)])
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+            )
+        is_admin = user.is_active and user.has_group(UserGroupEnum.ADMIN)
+        ttl = min(max(int(payload["exp"] - time.time()), 1), ADMIN_CHECK_CACHE_TTL)
+        try:
+            await redis.set(cache_key, int(is_admin), ex=ttl)
+        except RedisError:
+            pass
+
+    if not is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required"
         )
-    return current_user
+    return user
 
 
 async def get_current_moderator(
@@ -12,6 +12,7 @@ class BaseAppSettings(BaseSettings):
         BASE_DIR / "database" / "seed_data" / "imdb_movies.csv"
     )
     LOGIN_TIME_DAYS: int = 7
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
 
 def get_settings() -> BaseAppSettings:
@@ -37,6 +38,13 @@ class Settings(BaseAppSettings):
     POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "test_host")
     POSTGRES_DB_PORT: int = int(os.getenv("POSTGRES_DB_PORT", 5432))
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "test_db")
+    POSTGRES_POOL_SIZE: int = int(os.getenv("POSTGRES_POOL_SIZE", 20))
+    POSTGRES_MAX_OVERFLOW: int = int(os.getenv("POSTGRES_MAX_OVERFLOW", 10))
+    POSTGRES_POOL_TIMEOUT: int = int(os.getenv("POSTGRES_POOL_TIMEOUT", 10))
+    POSTGRES_POOL_RECYCLE: int = int(os.getenv("POSTGRES_POOL_RECYCLE", 1800))
+    POSTGRES_USE_PGBOUNCER: bool = (
+        os.getenv("POSTGRES_USE_PGBOUNCER", "False").lower() == "true"
+    )
 
     SECRET_KEY_ACCESS: str = os.getenv("SECRET_KEY_ACCESS", os.urandom(32).hex())
     SECRET_KEY_REFRESH: str = os.getenv("SECRET_KEY_REFRESH", os.urandom(32).hex())
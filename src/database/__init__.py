@@ -32,6 +32,7 @@ from src.database.models.movies import (
 )
 
 from src.database.session_sqlite import reset_sqlite_database as reset_database
+from src.database.utils import dialect_insert
 from src.database.validators import accounts as accounts_validators
 
 environment = os.getenv("ENVIRONMENT", "developing")
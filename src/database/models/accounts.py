@@ -2,6 +2,7 @@ import enum
 from datetime import datetime, date, timedelta, timezone
 from typing import List, Optional
 
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import (
     ForeignKey,
     String,
@@ -18,7 +19,11 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from src.database.models.base import Base
 from src.database.validators import accounts as validators
-from src.security.passwords import hash_password, verify_password
+from src.security.passwords import (
+    ahash_password,
+    hash_password,
+    verify_and_update_password,
+)
 from src.security.utils import generate_secure_token
 # Import of models from movies.py removed to avoid circular imports
 # Using string references in relationships
@@ -163,8 +168,29 @@ class UserModel(Base):
     def verify_password(self, raw_password: str) -> bool:
         """
         Verify the provided password against the stored hashed password.
+
+        If the stored hash was created with outdated settings, it is replaced with
+        a fresh hash and persisted on the next commit.
+        """
+        verified, new_hash = verify_and_update_password(
+            raw_password, self._hashed_password
+        )
+        if verified and new_hash:
+            self._hashed_password = new_hash
+        return verified
+
+    async def aset_password(self, raw_password: str) -> None:
+        """
+        Validate and set the user's password, hashing it on a worker thread.
+        """
+        validators.validate_password_strength(raw_password)
+        self._hashed_password = await ahash_password(raw_password)
+
+    async def averify_password(self, raw_password: str) -> bool:
+        """
+        Verify the provided password on a worker thread.
         """
-        return verify_password(raw_password, self._hashed_password)
+        return await run_in_threadpool(self.verify_password, raw_password)
 
     @validates("email")
     def validate_email(self, key, value):
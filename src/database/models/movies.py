@@ -10,12 +10,14 @@ from sqlalchemy import (
     UniqueConstraint,
     Date,
     ForeignKey,
+    Index,
     Table,
     Column,
     Boolean,
     Integer,
     DateTime,
     func,
+    text,
 )
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from sqlalchemy import Enum as SQLAlchemyEnum
@@ -286,7 +288,7 @@ class MovieCommentModel(Base):
         DateTime, default=datetime.datetime.utcnow, nullable=False
     )
     parent_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("movie_comments.id", ondelete="CASCADE"), nullable=True
+        ForeignKey("movie_comments.id", ondelete="CASCADE"), nullable=True, index=True
     )
 
     user = relationship("UserModel", back_populates="movie_comments")
@@ -461,6 +463,10 @@ class OrderStatusEnum(str, Enum):
 
 class OrderModel(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_user_status_created", "user_id", "status", "created_at"),
+        Index("ix_orders_user_created", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
@@ -490,6 +496,7 @@ class OrderModel(Base):
 
 class OrderItemModel(Base):
     __tablename__ = "order_items"
+    __table_args__ = (Index("ix_order_items_order_movie", "order_id", "movie_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     order_id: Mapped[int] = mapped_column(
@@ -520,6 +527,16 @@ class PaymentStatusEnum(str, Enum):
 
 class PaymentModel(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_user_created", "user_id", "created_at"),
+        Index(
+            "ix_payment_external_id",
+            "external_payment_id",
+            unique=True,
+            postgresql_where=text("external_payment_id IS NOT NULL"),
+            sqlite_where=text("external_payment_id IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
@@ -553,6 +570,7 @@ class PaymentModel(Base):
 
 class PaymentItemModel(Base):
     __tablename__ = "payment_items"
+    __table_args__ = (Index("ix_payment_items_payment", "payment_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     payment_id: Mapped[int] = mapped_column(
@@ -1,5 +1,6 @@
 import asyncio
 import math
+import os
 from typing import List, Dict, Tuple
 
 import pandas as pd
@@ -27,6 +28,10 @@ from src.database import get_db_contextmanager
 
 CHUNK_SIZE = 1000
 
+# Cleaned CSV data keyed by file path, stored with the file's mtime after the cleaned
+# copy was written back, so a re-run on an unchanged file skips the pandas work.
+_preprocessed_csv_cache: Dict[str, Tuple[int, pd.DataFrame]] = {}
+
 
 class CSVDatabaseSeeder:
     """
@@ -58,8 +63,14 @@ class CSVDatabaseSeeder:
         Load the CSV, remove duplicates, convert relevant columns to strings, and clean up data.
         Saves the cleaned CSV back to the same path, then returns the Pandas DataFrame.
 
+        The cleaned data is cached per process for as long as the file is unchanged.
+
         :return: A Pandas DataFrame containing cleaned movie data.
         """
+        cached = _preprocessed_csv_cache.get(self._csv_file_path)
+        if cached and cached[0] == os.stat(self._csv_file_path).st_mtime_ns:
+            return cached[1].copy()
+
         data = pd.read_csv(self._csv_file_path)
         data = data.drop_duplicates(subset=['names', 'date_x'], keep='first')
 
@@ -84,8 +95,16 @@ class CSVDatabaseSeeder:
         data['status'] = data['status'].str.strip()
 
         print("Preprocessing CSV file...")
-        data.to_csv(self._csv_file_path, index=False)
+        # Write to a temporary file and swap it in, so a concurrent reader (e.g. another
+        # test worker seeding its own database) never sees a half-written CSV.
+        tmp_path = f"{self._csv_file_path}.{os.getpid()}.tmp"
+        data.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self._csv_file_path)
         print(f"CSV file saved to {self._csv_file_path}")
+        _preprocessed_csv_cache[self._csv_file_path] = (
+            os.stat(self._csv_file_path).st_mtime_ns,
+            data.copy(),
+        )
         return data
 
     async def _seed_user_groups(self) -> None:
@@ -140,7 +159,7 @@ class CSVDatabaseSeeder:
         if new_records:
             for i in range(0, len(new_records), CHUNK_SIZE):
                 chunk = new_records[i : i + CHUNK_SIZE]
-                await self._db_session.execute(insert(model).values(chunk))
+                await self._db_session.execute(insert(model), chunk)
                 await self._db_session.flush()
 
             for i in range(0, len(new_items), CHUNK_SIZE):
@@ -159,6 +178,9 @@ class CSVDatabaseSeeder:
         """
         Insert data_list into the given table in chunks, displaying progress via tqdm.
 
+        Rows are passed as executemany parameters rather than rendered into a multi-row
+        VALUES clause, so the INSERT is compiled once and reused for every chunk.
+
         :param table: The SQLAlchemy table or model to insert into.
         :param data_list: A list of dictionaries, where each dict represents a row to insert.
         """
@@ -174,7 +196,7 @@ class CSVDatabaseSeeder:
             end = start + CHUNK_SIZE
             chunk = data_list[start:end]
             if chunk:
-                await self._db_session.execute(insert(table).values(chunk))
+                await self._db_session.execute(insert(table), chunk)
 
         await self._db_session.flush()
 
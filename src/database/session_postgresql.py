@@ -1,9 +1,9 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
+from uuid import uuid4
 
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from src.config.settings import get_settings
 
@@ -13,16 +13,38 @@ POSTGRESQL_DATABASE_URL = (
     f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@"
     f"{settings.POSTGRES_HOST}:{settings.POSTGRES_DB_PORT}/{settings.POSTGRES_DB}"
 )
-postgresql_engine = create_async_engine(POSTGRESQL_DATABASE_URL, echo=False)
-AsyncPostgresqlSessionLocal = sessionmaker(  # type: ignore
+connect_args = {}
+if settings.POSTGRES_USE_PGBOUNCER:
+    # PgBouncer in transaction mode may run each transaction on a different server
+    # connection, so prepared statements must be neither cached nor reused by name.
+    POSTGRESQL_DATABASE_URL += "?prepared_statement_cache_size=0"
+    connect_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+# One engine (and connection pool) per process, shared by every request
+postgresql_engine = create_async_engine(
+    POSTGRESQL_DATABASE_URL,
+    echo=False,
+    connect_args=connect_args,
+    pool_size=settings.POSTGRES_POOL_SIZE,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+    pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+)
+AsyncPostgresqlSessionLocal = async_sessionmaker(
     bind=postgresql_engine,
     class_=AsyncSession,
-    autocommit=False,
     autoflush=False,
     expire_on_commit=False,
 )
 
-sync_database_url = POSTGRESQL_DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
+sync_database_url = (
+    f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@"
+    f"{settings.POSTGRES_HOST}:{settings.POSTGRES_DB_PORT}/{settings.POSTGRES_DB}"
+)
 sync_postgresql_engine = create_engine(sync_database_url, echo=False)
 
 
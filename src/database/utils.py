@@ -0,0 +1,19 @@
+from sqlalchemy import Insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_insert(db: AsyncSession, model) -> Insert:
+    """
+    Build an INSERT for `model` that supports ON CONFLICT clauses.
+
+    PostgreSQL is used in production and SQLite in tests; both dialect-specific inserts
+    provide `on_conflict_do_update()` and `on_conflict_do_nothing()` with the same signature.
+
+    :param db: The session the statement will be executed with.
+    :param model: The ORM model to insert into.
+    :return: A PostgreSQL or SQLite `Insert` construct, depending on the session's bind.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
@@ -1,25 +1,34 @@
-import re
+from functools import lru_cache
 
 import email_validator
 
+from src.security.passwords import password_character_classes
+
+PASSWORD_SPECIAL_CHARACTERS = frozenset("@$!%*?&#")
+
 
 def validate_password_strength(password: str) -> str:
     if len(password) < 8:
         raise ValueError("Password must contain at least 8 characters.")
-    if not re.search(r'[A-Z]', password):
+    has_upper, has_lower, has_digit, has_special = password_character_classes(
+        password, PASSWORD_SPECIAL_CHARACTERS
+    )
+    if not has_upper:
         raise ValueError("Password must contain at least one uppercase letter.")
-    if not re.search(r'[a-z]', password):
+    if not has_lower:
         raise ValueError("Password must contain at least one lower letter.")
-    if not re.search(r'\d', password):
+    if not has_digit:
         raise ValueError("Password must contain at least one digit.")
-    if not re.search(r'[@$!%*?&#]', password):
+    if not has_special:
         raise ValueError(
             "Password must contain at least one special character: @, $, !, %, *, ?, #, &."
         )
     return password
 
 
+@lru_cache(maxsize=4096)
 def validate_email(user_email: str) -> str:
+    # Cached per process; UserModel lowercases the address before calling this.
     try:
         email_info = email_validator.validate_email(
             user_email, check_deliverability=False
@@ -1,6 +1,11 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import anyio
+
 from fastapi import FastAPI, Depends, Request
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from src.config.dependencies import get_current_user
 
 from src.routes import accounts_router, movie_router
@@ -11,6 +16,19 @@ from src.routes.actors import router as actors_router
 from src.routes.orders import router as orders_router
 from src.routes.payments import router as payments_router
 from src.routes.profiles import router as profiles_router
+from src.tasks.webhooks import payment_webhook_batcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Password hashing runs in the threadpool; give it room next to sync dependencies.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 40
+    webhook_worker = asyncio.create_task(payment_webhook_batcher.run())
+    yield
+    webhook_worker.cancel()
+    await asyncio.gather(webhook_worker, return_exceptions=True)
+    await payment_webhook_batcher.drain()
+
 
 app = FastAPI(
     title="Movies homework",
@@ -18,6 +36,8 @@ app = FastAPI(
     docs_url=None,  # Disable default docs
     redoc_url=None,  # Disable default redoc
     openapi_url=None,  # Disable default openapi.json
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 api_version_prefix = "/api/v1"
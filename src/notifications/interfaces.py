@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 
 
 class EmailSenderInterface(ABC):
+    __slots__ = ()
 
     @abstractmethod
     async def send_activation_email(self, email: str, activation_link: str) -> None:
@@ -2,6 +2,8 @@ from datetime import datetime, timezone
 from typing import cast
 
 from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from redis.asyncio import Redis
 from sqlalchemy import select, delete
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,12 +14,10 @@ from src.config.dependencies import (
     get_current_user,
     get_current_admin,
     get_accounts_email_notificator,
+    get_redis_client,
+    invalidate_cached_admin_check,
 )
-from src.security.passwords import (
-    validate_password_strength,
-    verify_password,
-    hash_password,
-)
+from src.security.passwords import validate_password_strength
 
 
 from src.config import get_jwt_auth_manager, BaseAppSettings
@@ -55,7 +55,6 @@ from src.schemas import (
 from src.utils.email import send_email
 
 from src.security.interfaces import JWTAuthManagerInterface
-from src.security.passwords import hash_password
 from src.notifications.interfaces import EmailSenderInterface
 
 router = APIRouter()
@@ -93,10 +92,8 @@ async def register_user(
     db: AsyncSession = Depends(get_db),
     email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
 ) -> UserRegistrationResponseSchema:
-    stmt = select(UserModel).where(UserModel.email == user_data.email)
-    result = await db.execute(stmt)
-    existing_user = result.scalars().first()
-    if existing_user:
+    stmt = select(UserModel.id).where(UserModel.email == user_data.email).limit(1)
+    if await db.scalar(stmt) is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"A user with this email {user_data.email} already exists.",
@@ -112,7 +109,8 @@ async def register_user(
         )
 
     try:
-        new_user = UserModel.create(
+        new_user = await run_in_threadpool(
+            UserModel.create,
             email=str(user_data.email),
             raw_password=user_data.password,
             group_id=user_group.id,
@@ -129,7 +127,6 @@ async def register_user(
         )
 
         await db.commit()
-        await db.refresh(new_user)
     except SQLAlchemyError as e:
         await db.rollback()
         raise HTTPException(
@@ -417,7 +414,7 @@ async def reset_password(
         )
 
     try:
-        user.password = data.password
+        await user.aset_password(data.password)
         await db.run_sync(lambda s: s.delete(token_record))
         await db.commit()
 
@@ -504,7 +501,7 @@ async def login_user(
     result = await db.execute(stmt)
     user = result.scalars().first()
 
-    if not user or not user.verify_password(login_data.password):
+    if not user or not await user.averify_password(login_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password.",
@@ -680,12 +677,12 @@ async def change_password(
     current_user: UserModel = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    if not verify_password(data.old_password, current_user.hashed_password):
+    if not await current_user.averify_password(data.old_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Old password is incorrect."
         )
     validate_password_strength(data.new_password)
-    current_user.hashed_password = hash_password(data.new_password)
+    await current_user.aset_password(data.new_password)
     db.add(current_user)
     await db.commit()
     return {"detail": "Password changed successfully."}
@@ -719,6 +716,7 @@ async def admin_activate_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
     current_admin: UserModel = Depends(get_current_admin),
+    redis: Redis = Depends(get_redis_client),
 ):
     user = await db.get(UserModel, user_id)
     if not user:
@@ -727,6 +725,7 @@ async def admin_activate_user(
         return MessageResponseSchema(message="User is already active.")
     user.is_active = True
     await db.commit()
+    await invalidate_cached_admin_check(redis, user_id)
     return MessageResponseSchema(message="User activated successfully.")
 
 
@@ -755,6 +754,7 @@ async def admin_change_user_group(
     data: ChangeUserGroupRequest,
     db: AsyncSession = Depends(get_db),
     current_admin: UserModel = Depends(get_current_admin),
+    redis: Redis = Depends(get_redis_client),
 ):
     """
     Change a user's group. Example request body:
@@ -772,6 +772,9 @@ async def admin_change_user_group(
         raise HTTPException(status_code=404, detail="Group not found")
     user.group_id = group.id
     await db.commit()
+
+    # The cached admin decision for this user is no longer valid
+    await invalidate_cached_admin_check(redis, user_id)
     return MessageResponseSchema(message=f"User group changed to {data.group.value}.")
 
 
@@ -816,7 +819,6 @@ async def update_notification(
         )
     notification.is_read = data.is_read
     await db.commit()
-    await db.refresh(notification)
     return notification
 
 
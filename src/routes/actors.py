@@ -12,15 +12,16 @@ router = APIRouter(prefix="/actors", tags=["actors"])
 
 @router.post("/", response_model=ActorSchema, status_code=status.HTTP_201_CREATED)
 async def create_actor(data: ActorSchema, db: AsyncSession = Depends(get_db)):
-    existing = await db.execute(select(ActorModel).where(ActorModel.name == data.name))
-    if existing.scalars().first():
+    existing = await db.scalar(
+        select(ActorModel.id).where(ActorModel.name == data.name).limit(1)
+    )
+    if existing is not None:
         raise HTTPException(
             status_code=409, detail="Actor with this name already exists."
         )
     actor = ActorModel(name=data.name)
     db.add(actor)
     await db.commit()
-    await db.refresh(actor)
     return actor
 
 
@@ -47,7 +48,6 @@ async def update_actor(
         raise HTTPException(status_code=404, detail="Actor not found.")
     actor.name = data.name
     await db.commit()
-    await db.refresh(actor)
     return actor
 
 
@@ -18,17 +18,18 @@ router = APIRouter(prefix="/certifications", tags=["certifications"])
 async def create_certification(
     data: CertificationCreateSchema, db: AsyncSession = Depends(get_db)
 ):
-    existing = await db.execute(
-        select(CertificationModel).where(CertificationModel.name == data.name)
+    existing = await db.scalar(
+        select(CertificationModel.id)
+        .where(CertificationModel.name == data.name)
+        .limit(1)
     )
-    if existing.scalars().first():
+    if existing is not None:
         raise HTTPException(
             status_code=409, detail="Certification with this name already exists."
         )
     certification = CertificationModel(name=data.name)
     db.add(certification)
     await db.commit()
-    await db.refresh(certification)
     return certification
 
 
@@ -57,7 +58,6 @@ async def update_certification(
         raise HTTPException(status_code=404, detail="Certification not found.")
     certification.name = data.name
     await db.commit()
-    await db.refresh(certification)
     return certification
 
 
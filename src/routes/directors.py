@@ -12,17 +12,16 @@ router = APIRouter(prefix="/directors", tags=["directors"])
 async def create_director(
     data: DirectorCreateSchema, db: AsyncSession = Depends(get_db)
 ):
-    existing = await db.execute(
-        select(DirectorModel).where(DirectorModel.name == data.name)
+    existing = await db.scalar(
+        select(DirectorModel.id).where(DirectorModel.name == data.name).limit(1)
     )
-    if existing.scalars().first():
+    if existing is not None:
         raise HTTPException(
             status_code=409, detail="Director with this name already exists."
         )
     director = DirectorModel(name=data.name)
     db.add(director)
     await db.commit()
-    await db.refresh(director)
     return director
 
 
@@ -49,7 +48,6 @@ async def update_director(
         raise HTTPException(status_code=404, detail="Director not found.")
     director.name = data.name
     await db.commit()
-    await db.refresh(director)
     return director
 
 
@@ -12,15 +12,16 @@ router = APIRouter(prefix="/genres", tags=["genres"])
 
 @router.post("/", response_model=GenreSchema, status_code=status.HTTP_201_CREATED)
 async def create_genre(data: GenreSchema, db: AsyncSession = Depends(get_db)):
-    existing = await db.execute(select(GenreModel).where(GenreModel.name == data.name))
-    if existing.scalars().first():
+    existing = await db.scalar(
+        select(GenreModel.id).where(GenreModel.name == data.name).limit(1)
+    )
+    if existing is not None:
         raise HTTPException(
             status_code=409, detail="Genre with this name already exists."
         )
     genre = GenreModel(name=data.name)
     db.add(genre)
     await db.commit()
-    await db.refresh(genre)
     return genre
 
 
@@ -47,7 +48,6 @@ async def update_genre(
         raise HTTPException(status_code=404, detail="Genre not found.")
     genre.name = data.name
     await db.commit()
-    await db.refresh(genre)
     return genre
 
 
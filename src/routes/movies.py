@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select, func, insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, aliased
+from sqlalchemy.orm import joinedload, selectinload, aliased
 from datetime import datetime, date
+from decimal import Decimal
+from typing import Optional
 
-from src.database import get_db, MovieModel
+from src.database import get_db, dialect_insert, MovieModel
 from src.database import CountryModel, GenreModel, ActorModel, LanguageModel
 from src.database.models.movies import (
     MovieLikeModel,
@@ -29,16 +33,68 @@ from src.schemas.movies import (
     MovieRatingAverageSchema,
     MovieCommentCreateSchema,
     MovieCommentResponseSchema,
+    CommentListAdapter,
     MovieCommentLikeRequestSchema,
     MovieCommentLikeCountSchema,
     CartItemCreateSchema,
     CartSchema,
     PurchasedMovieSchema,
+    PurchasedMovieListSchema,
 )
-from src.config.dependencies import get_current_user
+from src.config.dependencies import get_current_user, get_redis_client
 
 router = APIRouter()
 
+COMMENT_LIKES_CACHE_TTL = 60
+
+
+def comment_likes_cache_key(comment_id: int) -> str:
+    return f"comment:{comment_id}:likes"
+
+
+# Replies nested deeper than this are attached to their ancestor at this depth
+MAX_COMMENT_DEPTH = 20
+
+COMMENT_COLUMNS = (
+    MovieCommentModel.id,
+    MovieCommentModel.user_id,
+    MovieCommentModel.movie_id,
+    MovieCommentModel.text,
+    MovieCommentModel.created_at,
+    MovieCommentModel.parent_id,
+)
+
+
+def build_comment_tree(rows) -> dict[int, MovieCommentResponseSchema]:
+    """
+    Turn comment rows into response nodes linked to their replies, in one pass.
+
+    Rows must be ordered by id: a reply is always created after its parent, so the
+    parent node already exists when its reply is linked.
+
+    Returns:
+        dict[int, MovieCommentResponseSchema]: Every node by comment id; top-level
+        comments have `parent_id` set to None.
+    """
+    nodes: dict[int, MovieCommentResponseSchema] = {}
+    depths: dict[int, int] = {}
+    attach_to: dict[int, int] = {}
+    for row in rows:
+        node = MovieCommentResponseSchema.model_construct(**row._mapping, replies=[])
+        nodes[node.id] = node
+        parent_id = node.parent_id
+        if parent_id not in nodes:
+            depths[node.id] = 0
+            continue
+        depth = depths[parent_id] + 1
+        if depth > MAX_COMMENT_DEPTH:
+            parent_id = attach_to[parent_id]
+            depth = MAX_COMMENT_DEPTH
+        depths[node.id] = depth
+        attach_to[node.id] = parent_id
+        nodes[parent_id].replies.append(node)
+    return nodes
+
 
 @router.get(
     "/movies/",
@@ -208,13 +264,16 @@ async def create_movie(
         - 409 if a movie with the same name and date already exists.
         - 400 if input data is invalid (e.g., violating a constraint).
     """
-    existing_stmt = select(MovieModel).where(
-        (MovieModel.name == movie_data.name), (MovieModel.date == movie_data.date)
+    existing_stmt = (
+        select(MovieModel.id)
+        .where(
+            (MovieModel.name == movie_data.name), (MovieModel.date == movie_data.date)
+        )
+        .limit(1)
     )
-    existing_result = await db.execute(existing_stmt)
-    existing_movie = existing_result.scalars().first()
+    existing_movie_id = await db.scalar(existing_stmt)
 
-    if existing_movie:
+    if existing_movie_id is not None:
         raise HTTPException(
             status_code=409,
             detail=(
@@ -335,19 +394,20 @@ async def get_movie_by_id(
 
     :raises HTTPException: Raises a 404 error if the movie with the given ID is not found.
     """
+    # Collections are loaded with one IN query each; joining all three would return
+    # genres x actors x languages rows for a single movie.
     stmt = (
         select(MovieModel)
         .options(
             joinedload(MovieModel.country),
-            joinedload(MovieModel.genres),
-            joinedload(MovieModel.actors),
-            joinedload(MovieModel.languages),
+            selectinload(MovieModel.genres),
+            selectinload(MovieModel.actors),
+            selectinload(MovieModel.languages),
         )
         .where(MovieModel.id == movie_id)
     )
 
-    result = await db.execute(stmt)
-    movie = result.scalars().first()
+    movie = await db.scalar(stmt)
 
     if not movie:
         raise HTTPException(
@@ -581,13 +641,15 @@ async def add_movie_to_favorites(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    exists_stmt = select(FavoriteMovieModel).where(
-        FavoriteMovieModel.user_id == current_user.id,
-        FavoriteMovieModel.movie_id == movie_id,
+    exists_stmt = (
+        select(FavoriteMovieModel.id)
+        .where(
+            FavoriteMovieModel.user_id == current_user.id,
+            FavoriteMovieModel.movie_id == movie_id,
+        )
+        .limit(1)
     )
-    result = await db.execute(exists_stmt)
-    favorite = result.scalars().first()
-    if favorite:
+    if await db.scalar(exists_stmt) is not None:
         return  # Already in favorites
     favorite = FavoriteMovieModel(user_id=current_user.id, movie_id=movie_id)
     db.add(favorite)
@@ -753,7 +815,6 @@ async def rate_movie(
         )
         db.add(rating_obj)
     await db.commit()
-    await db.refresh(rating_obj)
     return rating_obj
 
 
@@ -825,8 +886,10 @@ async def create_movie_comment(
     )
     db.add(comment)
     await db.commit()
-    await db.refresh(comment)
-    return comment
+    return MovieCommentResponseSchema.model_construct(
+        **{column.key: getattr(comment, column.key) for column in COMMENT_COLUMNS},
+        replies=[],
+    )
 
 
 @router.get(
@@ -840,16 +903,16 @@ async def get_movie_comments(
     db: AsyncSession = Depends(get_db),
 ):
     stmt = (
-        select(MovieCommentModel)
-        .where(
-            MovieCommentModel.movie_id == movie_id,
-            MovieCommentModel.parent_id.is_(None),
-        )
-        .order_by(MovieCommentModel.created_at.desc())
+        select(*COMMENT_COLUMNS)
+        .where(MovieCommentModel.movie_id == movie_id)
+        .order_by(MovieCommentModel.id)
     )
     result = await db.execute(stmt)
-    comments = result.scalars().all()
-    return comments
+    nodes = build_comment_tree(result.all())
+    top_level = [node for node in nodes.values() if node.parent_id is None]
+    return Response(
+        CommentListAdapter.dump_json(top_level[::-1]), media_type="application/json"
+    )
 
 
 @router.patch(
@@ -873,8 +936,24 @@ async def update_movie_comment(
         )
     comment.text = data.text
     await db.commit()
-    await db.refresh(comment)
-    return comment
+
+    # Only the edited comment and its descendants are loaded, not the movie's whole
+    # thread; the reply nesting cap therefore counts from the edited comment.
+    subtree = (
+        select(MovieCommentModel.id)
+        .where(MovieCommentModel.id == comment.id)
+        .cte("comment_subtree", recursive=True)
+    )
+    subtree = subtree.union_all(
+        select(MovieCommentModel.id).where(MovieCommentModel.parent_id == subtree.c.id)
+    )
+    stmt = (
+        select(*COMMENT_COLUMNS)
+        .where(MovieCommentModel.id.in_(select(subtree.c.id)))
+        .order_by(MovieCommentModel.id)
+    )
+    result = await db.execute(stmt)
+    return build_comment_tree(result.all())[comment.id]
 
 
 @router.delete(
@@ -910,22 +989,24 @@ async def like_or_dislike_comment(
     data: MovieCommentLikeRequestSchema,
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
+    redis: Redis = Depends(get_redis_client),
 ):
-    stmt = select(MovieCommentLikeModel).where(
-        MovieCommentLikeModel.user_id == current_user.id,
-        MovieCommentLikeModel.comment_id == comment_id,
+    stmt = dialect_insert(db, MovieCommentLikeModel).values(
+        user_id=current_user.id, comment_id=comment_id, is_like=data.is_like
     )
-    result = await db.execute(stmt)
-    like_obj = result.scalars().first()
-    if like_obj:
-        like_obj.is_like = data.is_like
-    else:
-        like_obj = MovieCommentLikeModel(
-            user_id=current_user.id, comment_id=comment_id, is_like=data.is_like
-        )
-        db.add(like_obj)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "comment_id"],
+        set_={"is_like": stmt.excluded.is_like},
+    )
+    await db.execute(stmt)
     await db.commit()
 
+    # Drop the cached counts so the next read recomputes them
+    try:
+        await redis.delete(comment_likes_cache_key(comment_id))
+    except RedisError:
+        pass
+
 
 @router.get(
     "/comments/{comment_id}/likes",
@@ -936,7 +1017,18 @@ async def like_or_dislike_comment(
 async def get_comment_like_counts(
     comment_id: int,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis_client),
 ):
+    cache_key = comment_likes_cache_key(comment_id)
+    try:
+        cached = await redis.hgetall(cache_key)
+    except RedisError:
+        cached = None
+    if cached:
+        return MovieCommentLikeCountSchema(
+            likes=int(cached["likes"]), dislikes=int(cached["dislikes"])
+        )
+
     stmt = (
         select(MovieCommentLikeModel.is_like, func.count())
         .where(MovieCommentLikeModel.comment_id == comment_id)
@@ -945,12 +1037,33 @@ async def get_comment_like_counts(
     result = await db.execute(stmt)
     rows = result.all()
     counts = {row[0]: row[1] for row in rows}
-    return MovieCommentLikeCountSchema(
+    like_counts = MovieCommentLikeCountSchema(
         likes=counts.get(True, 0), dislikes=counts.get(False, 0)
     )
 
+    # MULTI/EXEC, so the hash is never left behind without its TTL
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(cache_key, mapping=like_counts.model_dump())
+            pipe.expire(cache_key, COMMENT_LIKES_CACHE_TTL)
+            await pipe.execute()
+    except RedisError:
+        pass
+
+    return like_counts
+
 
 # --- Shopping Cart endpoints ---
+async def compute_cart_total(db: AsyncSession, cart_id: int) -> Decimal:
+    stmt = (
+        select(func.coalesce(func.sum(MovieModel.price), 0))
+        .select_from(CartItemModel)
+        .join(MovieModel, MovieModel.id == CartItemModel.movie_id)
+        .where(CartItemModel.cart_id == cart_id)
+    )
+    return Decimal(await db.scalar(stmt))
+
+
 @router.post(
     "/cart/add",
     response_model=CartSchema,
@@ -975,7 +1088,11 @@ async def add_to_cart(
         )
 
     # Get or create user's cart
-    cart_stmt = select(CartModel).where(CartModel.user_id == current_user.id)
+    cart_stmt = (
+        select(CartModel)
+        .options(selectinload(CartModel.items).joinedload(CartItemModel.movie))
+        .where(CartModel.user_id == current_user.id)
+    )
     cart_result = await db.execute(cart_stmt)
     cart = cart_result.scalars().first()
 
@@ -996,10 +1113,13 @@ async def add_to_cart(
     cart_item = CartItemModel(cart_id=cart.id, movie_id=data.movie_id)
     db.add(cart_item)
     await db.commit()
-    await db.refresh(cart)
+
+    # Reload the cart with its items and movies in one round-trip
+    cart_result = await db.execute(cart_stmt.execution_options(populate_existing=True))
+    cart = cart_result.scalars().one()
 
     # Calculate total price
-    total_price = sum(item.movie.price for item in cart.items)
+    total_price = await compute_cart_total(db, cart.id)
     return CartSchema(
         id=cart.id, user_id=cart.user_id, items=cart.items, total_price=total_price
     )
@@ -1046,18 +1166,21 @@ async def get_cart(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    cart_stmt = select(CartModel).where(CartModel.user_id == current_user.id)
+    cart_stmt = (
+        select(CartModel)
+        .options(selectinload(CartModel.items).joinedload(CartItemModel.movie))
+        .where(CartModel.user_id == current_user.id)
+    )
     cart_result = await db.execute(cart_stmt)
     cart = cart_result.scalars().first()
 
     if not cart:
         # Create empty cart
-        cart = CartModel(user_id=current_user.id)
+        cart = CartModel(user_id=current_user.id, items=[])
         db.add(cart)
         await db.commit()
-        await db.refresh(cart)
 
-    total_price = sum(item.movie.price for item in cart.items)
+    total_price = await compute_cart_total(db, cart.id)
     return CartSchema(
         id=cart.id, user_id=cart.user_id, items=cart.items, total_price=total_price
     )
@@ -1074,31 +1197,41 @@ async def purchase_cart(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    cart_stmt = select(CartModel).where(CartModel.user_id == current_user.id)
+    cart_stmt = (
+        select(CartModel)
+        .options(selectinload(CartModel.items).joinedload(CartItemModel.movie))
+        .where(CartModel.user_id == current_user.id)
+    )
     cart_result = await db.execute(cart_stmt)
     cart = cart_result.scalars().first()
 
     if not cart or not cart.items:
         raise HTTPException(status_code=400, detail="Cart is empty.")
 
-    purchased_movies = []
+    # Find movies the user already owns in a single query
+    purchased_stmt = select(PurchasedMovieModel.movie_id).where(
+        PurchasedMovieModel.user_id == current_user.id,
+        PurchasedMovieModel.movie_id.in_([item.movie_id for item in cart.items]),
+    )
+    purchased_result = await db.execute(purchased_stmt)
+    already_purchased = set(purchased_result.scalars().all())
 
-    for item in cart.items:
-        # Check if user hasn't already purchased this movie
-        purchased_stmt = select(PurchasedMovieModel).where(
-            PurchasedMovieModel.user_id == current_user.id,
-            PurchasedMovieModel.movie_id == item.movie_id,
-        )
-        purchased_result = await db.execute(purchased_stmt)
-        if purchased_result.scalars().first():
-            continue  # Skip already purchased movies
+    purchase_rows = [
+        {
+            "user_id": current_user.id,
+            "movie_id": item.movie_id,
+            "price_paid": item.movie.price,
+        }
+        for item in cart.items
+        if item.movie_id not in already_purchased
+    ]
 
-        # Add to purchased
-        purchased_movie = PurchasedMovieModel(
-            user_id=current_user.id, movie_id=item.movie_id, price_paid=item.movie.price
+    purchased_movies = []
+    if purchase_rows:
+        purchased_result = await db.scalars(
+            insert(PurchasedMovieModel).returning(PurchasedMovieModel), purchase_rows
         )
-        db.add(purchased_movie)
-        purchased_movies.append(purchased_movie)
+        purchased_movies = purchased_result.all()
 
     # Clear cart
     await db.delete(cart)
@@ -1117,7 +1250,11 @@ async def clear_cart(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    cart_stmt = select(CartModel).where(CartModel.user_id == current_user.id)
+    cart_stmt = (
+        select(CartModel)
+        .options(selectinload(CartModel.items).joinedload(CartItemModel.movie))
+        .where(CartModel.user_id == current_user.id)
+    )
     cart_result = await db.execute(cart_stmt)
     cart = cart_result.scalars().first()
 
@@ -1128,18 +1265,33 @@ async def clear_cart(
 
 @router.get(
     "/purchased/",
-    response_model=list[PurchasedMovieSchema],
+    response_model=PurchasedMovieListSchema,
     summary="Get user's purchased movies",
-    description="Get all movies purchased by the current user.",
+    description=(
+        "Get movies purchased by the current user, newest first. "
+        "Pass `next_cursor` from the previous page as `cursor` to get the next page."
+    ),
 )
 async def get_purchased_movies(
+    cursor: Optional[int] = Query(
+        None, description="ID of the last purchase from the previous page"
+    ),
+    limit: int = Query(50, ge=1, le=200, description="Number of items per page"),
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    # Seek on the primary key: purchases made together share purchased_at,
+    # while ids grow with every purchase and never tie.
     stmt = (
         select(PurchasedMovieModel)
+        .options(joinedload(PurchasedMovieModel.movie))
         .where(PurchasedMovieModel.user_id == current_user.id)
-        .order_by(PurchasedMovieModel.purchased_at.desc())
     )
+    if cursor is not None:
+        stmt = stmt.where(PurchasedMovieModel.id < cursor)
+    stmt = stmt.order_by(PurchasedMovieModel.id.desc()).limit(limit)
+
     result = await db.execute(stmt)
-    return result.scalars().all()
+    items = result.scalars().all()
+    next_cursor = items[-1].id if len(items) == limit else None
+    return PurchasedMovieListSchema(items=items, next_cursor=next_cursor)
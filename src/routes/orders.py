@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, exists, insert, delete
+from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from src.database import (
     get_db,
+    get_db_contextmanager,
     CartModel,
     CartItemModel,
     PurchasedMovieModel,
@@ -14,11 +18,49 @@ from src.database import (
 from src.schemas.movies import OrderSchema, OrderCreateSchema, OrderItemSchema
 from src.config.dependencies import get_current_user, get_current_admin
 import datetime
+import logging
 from src.utils.email import send_email
 from typing import Optional
 from src.database import UserModel
 
 router = APIRouter(prefix="/orders", tags=["orders"])
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 500
+
+
+def admin_orders_query(
+    status: Optional[OrderStatusEnum],
+    user_id: Optional[int],
+    start_date: Optional[datetime.date],
+    end_date: Optional[datetime.date],
+):
+    stmt = select(OrderModel).options(
+        selectinload(OrderModel.items).joinedload(OrderItemModel.movie)
+    )
+
+    if status:
+        stmt = stmt.where(OrderModel.status == status)
+    if user_id:
+        stmt = stmt.where(OrderModel.user_id == user_id)
+    if start_date:
+        stmt = stmt.where(OrderModel.created_at >= start_date)
+    if end_date:
+        stmt = stmt.where(OrderModel.created_at <= end_date)
+
+    return stmt.order_by(OrderModel.created_at.desc())
+
+
+async def send_order_paid_email(recipient: str, order_id: int, total_amount) -> None:
+    try:
+        await send_email(
+            subject="Order Payment Confirmation",
+            recipient=recipient,
+            body=f"Your order #{order_id} has been successfully paid. Total amount: ${total_amount}. Thank you for your purchase!",
+        )
+    except Exception:
+        # Log error but don't fail the payment
+        logger.exception("Failed to send email confirmation for order %s", order_id)
 
 
 @router.post("/", response_model=OrderSchema, status_code=status.HTTP_201_CREATED)
@@ -27,50 +69,44 @@ async def create_order_from_cart(
     current_user=Depends(get_current_user),
 ):
     # Get user's cart
-    cart_stmt = select(CartModel).where(CartModel.user_id == current_user.id)
+    cart_stmt = (
+        select(CartModel)
+        .options(selectinload(CartModel.items).joinedload(CartItemModel.movie))
+        .where(CartModel.user_id == current_user.id)
+    )
     cart_result = await db.execute(cart_stmt)
     cart = cart_result.scalars().first()
     if not cart or not cart.items:
         raise HTTPException(status_code=400, detail="Your cart is empty.")
 
-    # Exclude already purchased movies
-    purchased_stmt = select(PurchasedMovieModel.movie_id).where(
-        PurchasedMovieModel.user_id == current_user.id
+    # Select the orderable cart items in one round-trip: skip movies the user
+    # already owns and movies that are waiting in another pending order.
+    purchased_exists = exists().where(
+        PurchasedMovieModel.user_id == current_user.id,
+        PurchasedMovieModel.movie_id == CartItemModel.movie_id,
+    )
+    pending_exists = exists().where(
+        OrderItemModel.movie_id == CartItemModel.movie_id,
+        OrderModel.id == OrderItemModel.order_id,
+        OrderModel.user_id == current_user.id,
+        OrderModel.status == OrderStatusEnum.PENDING,
     )
-    purchased_result = await db.execute(purchased_stmt)
-    purchased_movie_ids = {row[0] for row in purchased_result.all()}
-
-    # Exclude unavailable movies (deleted)
-    available_movie_ids = set()
-    for item in cart.items:
-        movie = await db.get(MovieModel, item.movie_id)
-        if movie:
-            available_movie_ids.add(item.movie_id)
-
-    # Check for pending orders with same movies
-    pending_stmt = (
-        select(OrderItemModel.movie_id)
-        .join(OrderModel)
+    orderable_stmt = (
+        select(CartItemModel, MovieModel)
+        .join(MovieModel, MovieModel.id == CartItemModel.movie_id)
         .where(
-            and_(
-                OrderModel.user_id == current_user.id,
-                OrderModel.status == OrderStatusEnum.PENDING,
-            )
+            CartItemModel.cart_id == cart.id,
+            ~purchased_exists,
+            ~pending_exists,
         )
     )
-    pending_result = await db.execute(pending_stmt)
-    pending_movie_ids = {row[0] for row in pending_result.all()}
-
-    # Filter movies to order
-    movies_to_order = [
-        item
-        for item in cart.items
-        if item.movie_id not in purchased_movie_ids
-        and item.movie_id in available_movie_ids
-        and item.movie_id not in pending_movie_ids
-    ]
+    orderable_result = await db.execute(orderable_stmt)
+    orderable = orderable_result.all()
+
+    movies_to_order = [item for item, _ in orderable]
+    orderable_movie_ids = {item.movie_id for item in movies_to_order}
     excluded_movies = [
-        item.movie_id for item in cart.items if item not in movies_to_order
+        item.movie_id for item in cart.items if item.movie_id not in orderable_movie_ids
     ]
 
     if not movies_to_order:
@@ -79,34 +115,35 @@ async def create_order_from_cart(
             detail="No movies available for order. All are already purchased, unavailable, or pending in another order.",
         )
 
-    # Create order
-    order = OrderModel(user_id=current_user.id, status=OrderStatusEnum.PENDING)
-    db.add(order)
-    await db.flush()
-
-    total_amount = 0.0
-    order_items = []
-    for item in movies_to_order:
-        movie = await db.get(MovieModel, item.movie_id)
-        order_item = OrderItemModel(
-            order_id=order.id, movie_id=movie.id, price_at_order=movie.price
+    # Create order; RETURNING hands back the id and server-side created_at
+    order = await db.scalar(
+        insert(OrderModel)
+        .values(
+            user_id=current_user.id,
+            status=OrderStatusEnum.PENDING,
+            total_amount=sum(movie.price for _, movie in orderable),
         )
-        db.add(order_item)
-        order_items.append(order_item)
-        total_amount += float(movie.price)
+        .returning(OrderModel)
+    )
 
-    order.total_amount = total_amount
-    await db.commit()
-    await db.refresh(order)
+    order_item_rows = [
+        {"order_id": order.id, "movie_id": movie.id, "price_at_order": movie.price}
+        for _, movie in orderable
+    ]
+    order_items_result = await db.scalars(
+        insert(OrderItemModel).returning(OrderItemModel), order_item_rows
+    )
+    set_committed_value(order, "items", order_items_result.all())
 
-    # Optionally: remove these items from cart
-    for item in movies_to_order:
-        await db.delete(item)
+    # Remove ordered movies from the cart in the same transaction as the order
+    await db.execute(
+        delete(CartItemModel).where(
+            CartItemModel.cart_id == cart.id,
+            CartItemModel.movie_id.in_(orderable_movie_ids),
+        )
+    )
     await db.commit()
 
-    # Attach items for response
-    order.items = order_items
-
     # Optionally: return excluded movie IDs for notification
     order_dict = OrderSchema.model_validate(order).model_dump()
     order_dict["excluded_movies"] = excluded_movies
@@ -120,13 +157,18 @@ async def create_order_from_cart(
     description="Get all orders for the current user.",
 )
 async def list_user_orders(
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of orders"),
+    offset: int = Query(0, ge=0, description="Number of orders to skip"),
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     stmt = (
         select(OrderModel)
+        .options(selectinload(OrderModel.items).joinedload(OrderItemModel.movie))
         .where(OrderModel.user_id == current_user.id)
         .order_by(OrderModel.created_at.desc())
+        .limit(limit)
+        .offset(offset)
     )
     result = await db.execute(stmt)
     orders = result.scalars().all()
@@ -144,7 +186,11 @@ async def get_order_details(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    order = await db.get(OrderModel, order_id)
+    order = await db.get(
+        OrderModel,
+        order_id,
+        options=[selectinload(OrderModel.items).joinedload(OrderItemModel.movie)],
+    )
     if not order or order.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Order not found.")
     return order
@@ -161,7 +207,11 @@ async def cancel_order(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    order = await db.get(OrderModel, order_id)
+    order = await db.get(
+        OrderModel,
+        order_id,
+        options=[selectinload(OrderModel.items).joinedload(OrderItemModel.movie)],
+    )
     if not order or order.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Order not found.")
 
@@ -170,9 +220,8 @@ async def cancel_order(
             status_code=400, detail="Only pending orders can be cancelled."
         )
 
-    order.status = OrderStatusEnum.CANCELLED
+    order.status = OrderStatusEnum.CANCELED
     await db.commit()
-    await db.refresh(order)
     return order
 
 
@@ -184,10 +233,15 @@ async def cancel_order(
 )
 async def pay_for_order(
     order_id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    order = await db.get(OrderModel, order_id)
+    order = await db.get(
+        OrderModel,
+        order_id,
+        options=[selectinload(OrderModel.items).joinedload(OrderItemModel.movie)],
+    )
     if not order or order.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Order not found.")
 
@@ -200,27 +254,25 @@ async def pay_for_order(
     order.status = OrderStatusEnum.PAID
 
     # Move movies to purchased list
-    for item in order.items:
-        purchased_movie = PurchasedMovieModel(
-            user_id=current_user.id,
-            movie_id=item.movie_id,
-            purchased_at=datetime.datetime.utcnow(),
+    await db.execute(
+        insert(PurchasedMovieModel).values(
+            [
+                {
+                    "user_id": current_user.id,
+                    "movie_id": item.movie_id,
+                    "price_paid": item.price_at_order,
+                }
+                for item in order.items
+            ]
         )
-        db.add(purchased_movie)
+    )
 
     await db.commit()
-    await db.refresh(order)
 
-    # Send email confirmation
-    try:
-        await send_email(
-            subject="Order Payment Confirmation",
-            recipient=current_user.email,
-            body=f"Your order #{order.id} has been successfully paid. Total amount: ${order.total_amount}. Thank you for your purchase!",
-        )
-    except Exception as e:
-        # Log error but don't fail the payment
-        print(f"Failed to send email confirmation: {e}")
+    # Send email confirmation after the response is returned
+    background_tasks.add_task(
+        send_order_paid_email, current_user.email, order.id, order.total_amount
+    )
 
     return order
 
@@ -242,21 +294,47 @@ async def admin_list_orders(
     end_date: Optional[datetime.date] = Query(
         None, description="Filter orders until this date"
     ),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of orders"),
+    offset: int = Query(0, ge=0, description="Number of orders to skip"),
     db: AsyncSession = Depends(get_db),
     current_admin: UserModel = Depends(get_current_admin),
 ):
-    stmt = select(OrderModel)
-
-    if status:
-        stmt = stmt.where(OrderModel.status == status)
-    if user_id:
-        stmt = stmt.where(OrderModel.user_id == user_id)
-    if start_date:
-        stmt = stmt.where(OrderModel.created_at >= start_date)
-    if end_date:
-        stmt = stmt.where(OrderModel.created_at <= end_date)
-
-    stmt = stmt.order_by(OrderModel.created_at.desc())
+    stmt = admin_orders_query(status, user_id, start_date, end_date)
+    stmt = stmt.limit(limit).offset(offset)
     result = await db.execute(stmt)
     orders = result.scalars().all()
     return orders
+
+
+@router.get(
+    "/admin/orders/export",
+    response_class=StreamingResponse,
+    summary="Admin: Export orders",
+    description="Stream all orders matching the filters as NDJSON, one order per line (admin only)",
+)
+async def admin_export_orders(
+    status: Optional[OrderStatusEnum] = Query(
+        None, description="Filter by order status"
+    ),
+    user_id: Optional[int] = Query(None, description="Filter by user ID"),
+    start_date: Optional[datetime.date] = Query(
+        None, description="Filter orders from this date"
+    ),
+    end_date: Optional[datetime.date] = Query(
+        None, description="Filter orders until this date"
+    ),
+    current_admin: UserModel = Depends(get_current_admin),
+):
+    stmt = admin_orders_query(status, user_id, start_date, end_date)
+
+    async def stream_orders():
+        # The request-scoped session is closed before the body is streamed,
+        # so the export reads through its own session.
+        async with get_db_contextmanager() as db:
+            orders = await db.stream_scalars(
+                stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for order in orders:
+                yield OrderSchema.model_validate(order).model_dump_json() + "\n"
+
+    return StreamingResponse(stream_orders(), media_type="application/x-ndjson")
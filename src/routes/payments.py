@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 from src.database import (
     get_db,
+    get_db_contextmanager,
     PaymentModel,
     PaymentItemModel,
     OrderModel,
@@ -17,12 +20,49 @@ from src.config.dependencies import (
     get_accounts_email_notificator,
 )
 import datetime
+import logging
 from src.utils.email import send_email
 from typing import Optional
 from src.database import UserModel
 from src.notifications.interfaces import EmailSenderInterface
+from src.tasks.webhooks import payment_webhook_batcher
 
 router = APIRouter(prefix="/payments", tags=["payments"])
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 500
+
+WEBHOOK_PAYMENT_STATUSES = {
+    "payment_intent.succeeded": PaymentStatusEnum.SUCCESSFUL,
+    "payment_intent.payment_failed": PaymentStatusEnum.CANCELED,
+}
+
+
+def admin_payments_query(
+    status: Optional[PaymentStatusEnum],
+    user_id: Optional[int],
+    start_date: Optional[datetime.date],
+    end_date: Optional[datetime.date],
+):
+    stmt = select(PaymentModel).options(selectinload(PaymentModel.items))
+
+    if status:
+        stmt = stmt.where(PaymentModel.status == status)
+    if user_id:
+        stmt = stmt.where(PaymentModel.user_id == user_id)
+    if start_date:
+        stmt = stmt.where(PaymentModel.created_at >= start_date)
+    if end_date:
+        stmt = stmt.where(PaymentModel.created_at <= end_date)
+
+    return stmt.order_by(PaymentModel.created_at.desc())
+
+
+async def send_payment_email(send, email: str, login_link: str, error_message: str):
+    try:
+        await send(email=email, login_link=login_link)
+    except Exception:
+        logger.exception(error_message)
 
 
 @router.post(
@@ -34,12 +74,15 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 )
 async def create_payment(
     payment_data: PaymentCreateSchema,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
     email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
 ):
     # Verify the order exists and belongs to the user
-    order = await db.get(OrderModel, payment_data.order_id)
+    order = await db.get(
+        OrderModel, payment_data.order_id, options=[selectinload(OrderModel.items)]
+    )
     if not order or order.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Order not found.")
 
@@ -56,41 +99,41 @@ async def create_payment(
     try:
         # Here you would integrate with Stripe API
         # For now, we simulate a successful payment
-        stripe_payment_id = f"stripe_{datetime.datetime.utcnow().timestamp()}"
+        now = datetime.datetime.now(datetime.timezone.utc)
+        stripe_payment_id = f"stripe_{now.timestamp()}"
 
-        # Create payment record
+        # Create payment record with its items; created_at is set here so the
+        # response can be served without reading the row back
         payment = PaymentModel(
             user_id=current_user.id,
             order_id=order.id,
             amount=payment_data.amount,
             external_payment_id=payment_data.external_payment_id or stripe_payment_id,
             status=PaymentStatusEnum.SUCCESSFUL,
+            created_at=now,
+            items=[
+                PaymentItemModel(
+                    order_item_id=order_item.id,
+                    price_at_payment=order_item.price_at_order,
+                )
+                for order_item in order.items
+            ],
         )
         db.add(payment)
-        await db.flush()
-
-        # Create payment items
-        for order_item in order.items:
-            payment_item = PaymentItemModel(
-                payment_id=payment.id,
-                order_item_id=order_item.id,
-                price_at_payment=order_item.price_at_order,
-            )
-            db.add(payment_item)
 
         # Update order status
         order.status = OrderStatusEnum.PAID
 
         await db.commit()
-        await db.refresh(payment)
 
-        # Send email confirmation
-        try:
-            await email_sender.send_activation_complete_email(
-                email=current_user.email, login_link=f"/orders/{order.id}"
-            )
-        except Exception as e:
-            print(f"Failed to send payment confirmation email: {e}")
+        # Send email confirmation after the response is returned
+        background_tasks.add_task(
+            send_payment_email,
+            email_sender.send_activation_complete_email,
+            current_user.email,
+            f"/orders/{order.id}",
+            "Failed to send payment confirmation email",
+        )
 
         return payment
 
@@ -108,13 +151,18 @@ async def create_payment(
     description="Get all payments for the current user",
 )
 async def list_user_payments(
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of payments"),
+    offset: int = Query(0, ge=0, description="Number of payments to skip"),
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     stmt = (
         select(PaymentModel)
+        .options(selectinload(PaymentModel.items))
         .where(PaymentModel.user_id == current_user.id)
         .order_by(PaymentModel.created_at.desc())
+        .limit(limit)
+        .offset(offset)
     )
     result = await db.execute(stmt)
     payments = result.scalars().all()
@@ -132,7 +180,9 @@ async def get_payment_details(
     db: AsyncSession = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    payment = await db.get(PaymentModel, payment_id)
+    payment = await db.get(
+        PaymentModel, payment_id, options=[selectinload(PaymentModel.items)]
+    )
     if not payment or payment.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Payment not found.")
     return payment
@@ -146,11 +196,16 @@ async def get_payment_details(
 )
 async def refund_payment(
     payment_id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_admin: UserModel = Depends(get_current_admin),
     email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
 ):
-    payment = await db.get(PaymentModel, payment_id)
+    payment = await db.get(
+        PaymentModel,
+        payment_id,
+        options=[joinedload(PaymentModel.user), selectinload(PaymentModel.items)],
+    )
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found.")
 
@@ -163,15 +218,15 @@ async def refund_payment(
     try:
         payment.status = PaymentStatusEnum.REFUNDED
         await db.commit()
-        await db.refresh(payment)
 
-        # Send refund confirmation email
-        try:
-            await email_sender.send_password_reset_complete_email(
-                email=payment.user.email, login_link=f"/orders/{payment.order_id}"
-            )
-        except Exception as e:
-            print(f"Failed to send refund confirmation email: {e}")
+        # Send refund confirmation email after the response is returned
+        background_tasks.add_task(
+            send_payment_email,
+            email_sender.send_password_reset_complete_email,
+            payment.user.email,
+            f"/orders/{payment.order_id}",
+            "Failed to send refund confirmation email",
+        )
 
         return payment
 
@@ -199,70 +254,71 @@ async def admin_list_payments(
     end_date: Optional[datetime.date] = Query(
         None, description="Filter payments until this date"
     ),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of payments"),
+    offset: int = Query(0, ge=0, description="Number of payments to skip"),
     db: AsyncSession = Depends(get_db),
     current_admin: UserModel = Depends(get_current_admin),
 ):
-    stmt = select(PaymentModel)
-
-    if status:
-        stmt = stmt.where(PaymentModel.status == status)
-    if user_id:
-        stmt = stmt.where(PaymentModel.user_id == user_id)
-    if start_date:
-        stmt = stmt.where(PaymentModel.created_at >= start_date)
-    if end_date:
-        stmt = stmt.where(PaymentModel.created_at <= end_date)
-
-    stmt = stmt.order_by(PaymentModel.created_at.desc())
+    stmt = admin_payments_query(status, user_id, start_date, end_date)
+    stmt = stmt.limit(limit).offset(offset)
     result = await db.execute(stmt)
     payments = result.scalars().all()
     return payments
 
 
+@router.get(
+    "/admin/payments/export",
+    response_class=StreamingResponse,
+    summary="Admin: Export payments",
+    description="Stream all payments matching the filters as NDJSON, one payment per line (admin only)",
+)
+async def admin_export_payments(
+    status: Optional[PaymentStatusEnum] = Query(
+        None, description="Filter by payment status"
+    ),
+    user_id: Optional[int] = Query(None, description="Filter by user ID"),
+    start_date: Optional[datetime.date] = Query(
+        None, description="Filter payments from this date"
+    ),
+    end_date: Optional[datetime.date] = Query(
+        None, description="Filter payments until this date"
+    ),
+    current_admin: UserModel = Depends(get_current_admin),
+):
+    stmt = admin_payments_query(status, user_id, start_date, end_date)
+
+    async def stream_payments():
+        # The request-scoped session is closed before the body is streamed,
+        # so the export reads through its own session.
+        async with get_db_contextmanager() as db:
+            payments = await db.stream_scalars(
+                stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for payment in payments:
+                yield PaymentSchema.model_validate(payment).model_dump_json() + "\n"
+
+    return StreamingResponse(stream_payments(), media_type="application/x-ndjson")
+
+
 @router.post(
     "/webhook/stripe",
     summary="Stripe webhook",
     description="Handle Stripe webhook events for payment validation",
 )
-async def stripe_webhook(
-    request: dict,
-    db: AsyncSession = Depends(get_db),
-):
+async def stripe_webhook(request: dict):
     # Here you would validate the webhook signature and process Stripe events
     # For now, we'll simulate webhook processing
 
     event_type = request.get("type")
     data = request.get("data", {})
 
-    if event_type == "payment_intent.succeeded":
-        # Handle successful payment
-        payment_intent = data.get("object", {})
-        external_payment_id = payment_intent.get("id")
-
-        # Find and update payment
-        stmt = select(PaymentModel).where(
-            PaymentModel.external_payment_id == external_payment_id
-        )
-        result = await db.execute(stmt)
-        payment = result.scalars().first()
-
-        if payment:
-            payment.status = PaymentStatusEnum.SUCCESSFUL
-            await db.commit()
-
-    elif event_type == "payment_intent.payment_failed":
-        # Handle failed payment
-        payment_intent = data.get("object", {})
-        external_payment_id = payment_intent.get("id")
-
-        stmt = select(PaymentModel).where(
-            PaymentModel.external_payment_id == external_payment_id
-        )
-        result = await db.execute(stmt)
-        payment = result.scalars().first()
-
-        if payment:
-            payment.status = PaymentStatusEnum.CANCELED
-            await db.commit()
+    new_status = WEBHOOK_PAYMENT_STATUSES.get(event_type)
+    if new_status is None:
+        return {"status": "processed"}
 
-    return {"status": "processed"}
+    # Writes are batched by the webhook worker; Stripe only needs a 2xx back
+    payment_intent_id = data.get("object", {}).get("id")
+    if not payment_intent_id:
+        raise HTTPException(status_code=400, detail="Payment intent id is missing.")
+    await payment_webhook_batcher.put(payment_intent_id, new_status)
+    return {"status": "queued"}
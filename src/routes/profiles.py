@@ -1,26 +1,151 @@
+import asyncio
+import logging
+from typing import BinaryIO, Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from src.database import get_db, UserProfileModel, UserModel
+from src.database import get_db, dialect_insert, UserProfileModel, UserModel
 from src.schemas.profiles import ProfileCreateSchema, ProfileResponseSchema
-from src.config.dependencies import get_current_user, get_s3_storage_client
+from src.config.dependencies import (
+    get_current_user,
+    get_redis_client,
+    get_s3_storage_client,
+)
 from src.storages import S3StorageInterface
-from src.exceptions import S3FileUploadError
+from src.exceptions import BaseS3Error, S3FileUploadError
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_TTL = 300
+
+
+def profile_cache_key(user_id: int) -> str:
+    return f"profile:{user_id}"
+
+
+async def get_cached_profile(
+    db: AsyncSession, redis: Redis, user_id: int
+) -> ProfileResponseSchema:
+    """
+    Return the user's profile, reading through a Redis cache keyed by user id.
+
+    Raises:
+        HTTPException: 404 if the user has no profile.
+    """
+    cache_key = profile_cache_key(user_id)
+    try:
+        cached = await redis.get(cache_key)
+    except RedisError:
+        cached = None
+    if cached:
+        return ProfileResponseSchema.model_validate_json(cached)
+
+    stmt = select(UserProfileModel).where(UserProfileModel.user_id == user_id)
+    result = await db.execute(stmt)
+    profile = result.scalars().first()
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    profile_schema = ProfileResponseSchema.from_model(profile)
+
+    try:
+        await redis.set(
+            cache_key, profile_schema.model_dump_json(), ex=PROFILE_CACHE_TTL
+        )
+    except RedisError:
+        pass
+
+    return profile_schema
+
+
+async def invalidate_cached_profile(redis: Redis, user_id: int) -> None:
+    try:
+        await redis.delete(profile_cache_key(user_id))
+    except RedisError:
+        pass
+
+
+async def insert_profile(
+    db: AsyncSession, user_id: int, profile_data: ProfileCreateSchema, avatar: str
+) -> Optional[UserProfileModel]:
+    """
+    Insert a profile for the user unless one already exists.
+
+    Uses a single INSERT ... ON CONFLICT (user_id) DO NOTHING RETURNING statement, so
+    concurrent requests cannot both create a profile. The caller commits.
+
+    Returns:
+        Optional[UserProfileModel]: The new profile, or None if the user already has one.
+    """
+    stmt = (
+        dialect_insert(db, UserProfileModel)
+        .values(
+            user_id=user_id,
+            first_name=profile_data.first_name,
+            last_name=profile_data.last_name,
+            gender=profile_data.gender,
+            date_of_birth=profile_data.date_of_birth,
+            info=profile_data.info,
+            avatar=avatar,
+        )
+        .on_conflict_do_nothing(index_elements=["user_id"])
+        .returning(UserProfileModel)
+    )
+    return await db.scalar(stmt)
+
+
+async def commit_profile_with_avatar(
+    db: AsyncSession,
+    s3: S3StorageInterface,
+    redis: Redis,
+    profile: UserProfileModel,
+    avatar_key: str,
+    avatar_file: BinaryIO,
+) -> None:
+    """
+    Commit a freshly inserted profile while its avatar uploads to S3.
+
+    The upload and the commit run concurrently. If the upload fails after the commit
+    went through, the profile is deleted again so no profile is left without its avatar,
+    and its cache entry is dropped in case a read cached it in the meantime. If the
+    commit fails after the upload went through, the uploaded avatar is deleted so no
+    object is left in S3 without its profile.
+
+    Raises:
+        HTTPException: 500 if the avatar upload fails.
+    """
+    upload_error, commit_error = await asyncio.gather(
+        s3.upload_file(avatar_key, avatar_file), db.commit(), return_exceptions=True
+    )
+    if commit_error is not None:
+        if upload_error is None:
+            try:
+                await s3.delete_file(avatar_key)
+            except BaseS3Error:
+                logger.exception("Failed to delete orphaned avatar %s", avatar_key)
+        raise commit_error
+    if upload_error is not None:
+        await db.delete(profile)
+        await db.commit()
+        await invalidate_cached_profile(redis, profile.user_id)
+        if isinstance(upload_error, S3FileUploadError):
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to upload avatar. Please try again later.",
+            )
+        raise upload_error
 
 
 @router.get("/me", response_model=ProfileResponseSchema)
 async def get_my_profile(
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
+    redis: Redis = Depends(get_redis_client),
 ):
-    stmt = select(UserProfileModel).where(UserProfileModel.user_id == current_user.id)
-    result = await db.execute(stmt)
-    profile = result.scalars().first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found.")
-    return ProfileResponseSchema.model_validate(profile, from_attributes=True)
+    return await get_cached_profile(db, redis, current_user.id)
 
 
 @router.post(
@@ -31,35 +156,19 @@ async def create_profile(
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
     s3: S3StorageInterface = Depends(get_s3_storage_client),
+    redis: Redis = Depends(get_redis_client),
 ):
-    stmt = select(UserProfileModel).where(UserProfileModel.user_id == current_user.id)
-    result = await db.execute(stmt)
-    existing_profile = result.scalars().first()
-    if existing_profile:
-        raise HTTPException(status_code=400, detail="Profile already exists.")
-    # Save avatar to S3
     avatar_file = profile_data.avatar
-    avatar_bytes = await avatar_file.read()
-    try:
-        await s3.upload_file(avatar_file.filename, avatar_bytes)
-    except S3FileUploadError:
-        raise HTTPException(
-            status_code=500, detail="Failed to upload avatar. Please try again later."
-        )
     avatar_url = await s3.get_file_url(avatar_file.filename)
-    profile = UserProfileModel(
-        user_id=current_user.id,
-        first_name=profile_data.first_name,
-        last_name=profile_data.last_name,
-        gender=profile_data.gender,
-        date_of_birth=profile_data.date_of_birth,
-        info=profile_data.info,
-        avatar=avatar_url,
+    profile = await insert_profile(db, current_user.id, profile_data, avatar_url)
+    if profile is None:
+        raise HTTPException(status_code=400, detail="Profile already exists.")
+    # Save avatar to S3
+    await commit_profile_with_avatar(
+        db, s3, redis, profile, avatar_file.filename, avatar_file.file
     )
-    db.add(profile)
-    await db.commit()
-    await db.refresh(profile)
-    return ProfileResponseSchema.model_validate(profile)
+    await invalidate_cached_profile(redis, current_user.id)
+    return ProfileResponseSchema.from_model(profile)
 
 
 @router.post(
@@ -73,6 +182,7 @@ async def create_user_profile(
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
     s3: S3StorageInterface = Depends(get_s3_storage_client),
+    redis: Redis = Depends(get_redis_client),
 ):
     # Only the owner or admin can create a profile for a user
     is_admin = getattr(current_user, 'group_id', None) == 3
@@ -83,40 +193,19 @@ async def create_user_profile(
     # Only active users can create a profile
     if not current_user.is_active:
         raise HTTPException(status_code=401, detail="User not found or not active.")
-    stmt = select(UserProfileModel).where(UserProfileModel.user_id == user_id)
-    result = await db.execute(stmt)
-    existing_profile = result.scalars().first()
-    if existing_profile:
+    avatar_key = f"avatars/{user_id}_avatar.jpg"
+    # Store only the key in DB
+    profile = await insert_profile(db, user_id, profile_data, avatar_key)
+    if profile is None:
         raise HTTPException(status_code=400, detail="User already has a profile.")
-    try:
-        # Save avatar to S3
-        avatar_file = profile_data.avatar
-        avatar_bytes = await avatar_file.read()
-        avatar_key = f"avatars/{user_id}_avatar.jpg"
-        await s3.upload_file(avatar_key, avatar_bytes)
-    except S3FileUploadError:
-        raise HTTPException(
-            status_code=500, detail="Failed to upload avatar. Please try again later."
-        )
-    profile = UserProfileModel(
-        user_id=user_id,
-        first_name=profile_data.first_name,
-        last_name=profile_data.last_name,
-        gender=profile_data.gender,
-        date_of_birth=profile_data.date_of_birth,
-        info=profile_data.info,
-        avatar=avatar_key,  # Store only the key in DB
+    # Save avatar to S3
+    await commit_profile_with_avatar(
+        db, s3, redis, profile, avatar_key, profile_data.avatar.file
     )
-    db.add(profile)
-    await db.commit()
-    await db.refresh(profile)
+    await invalidate_cached_profile(redis, user_id)
     # Return response with avatar URL
     avatar_url = await s3.get_file_url(avatar_key)
-    response = ProfileResponseSchema.model_validate(
-        profile, from_attributes=True
-    ).model_dump()
-    response["avatar"] = avatar_url
-    return response
+    return ProfileResponseSchema.from_model(profile, avatar=avatar_url)
 
 
 @router.get("/users/{user_id}/profile/", response_model=ProfileResponseSchema)
@@ -124,10 +213,6 @@ async def get_user_profile(
     user_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
+    redis: Redis = Depends(get_redis_client),
 ):
-    stmt = select(UserProfileModel).where(UserProfileModel.user_id == user_id)
-    result = await db.execute(stmt)
-    profile = result.scalars().first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found.")
-    return ProfileResponseSchema.model_validate(profile, from_attributes=True)
+    return await get_cached_profile(db, redis, user_id)
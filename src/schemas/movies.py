@@ -1,7 +1,7 @@
 from datetime import date, datetime, timezone
 from typing import Optional, List
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 from src.database.models.movies import MovieStatusEnum
 from src.schemas.examples.movies import (
@@ -150,15 +150,15 @@ class MovieCreateSchema(BaseModel):
         "json_schema_extra": {"examples": [movie_create_schema_example]},
     }
 
-    @field_validator("country", mode="before")
+    @field_validator("country", mode="after")
     @classmethod
     def normalize_country(cls, value: str) -> str:
         return value.upper()
 
-    @field_validator("genres", "actors", "languages", mode="before")
+    @field_validator("genres", "actors", "languages", mode="after")
     @classmethod
     def normalize_list_fields(cls, value: List[str]) -> List[str]:
-        return [item.title() for item in value]
+        return list(map(str.title, value))
 
 
 class MovieUpdateSchema(BaseModel):
@@ -207,6 +207,9 @@ class MovieCommentResponseSchema(BaseModel):
 
 MovieCommentResponseSchema.model_rebuild()
 
+# Built once at import; serializes whole comment threads straight to JSON bytes
+CommentListAdapter = TypeAdapter(List[MovieCommentResponseSchema])
+
 
 class MovieCommentLikeRequestSchema(BaseModel):
     is_like: bool
@@ -299,6 +302,11 @@ class PurchasedMovieSchema(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class PurchasedMovieListSchema(BaseModel):
+    items: list[PurchasedMovieSchema]
+    next_cursor: Optional[int] = None
+
+
 class CartItemCreateSchema(BaseModel):
     movie_id: int
 
@@ -142,3 +142,15 @@ class ProfileResponseSchema(BaseModel):
     date_of_birth: date
     info: str
     avatar: str
+
+    @classmethod
+    def from_model(cls, profile, **overrides) -> "ProfileResponseSchema":
+        """
+        Build the response from a profile loaded from the database without validation.
+
+        Only for trusted ORM rows: the columns already have the right types, so the
+        validation pass of `model_validate(..., from_attributes=True)` is skipped.
+        """
+        data = {name: getattr(profile, name) for name in cls.model_fields}
+        data.update(overrides)
+        return cls.model_construct(**data)
@@ -1,8 +1,45 @@
+from typing import Optional
+
 from passlib.context import CryptContext
-import re
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=12, deprecated="auto")
+
+PASSWORD_SPECIAL_CHARACTERS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+
+def password_character_classes(
+    password: str, specials: frozenset = PASSWORD_SPECIAL_CHARACTERS
+) -> tuple[bool, bool, bool, bool]:
+    """
+    Scan a password once and report which character classes it contains.
 
-pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=14, deprecated="auto")
+    The scan stops as soon as all four classes have been seen.
+
+    Args:
+        password (str): The password to scan.
+        specials (frozenset): Characters that count as special characters.
+
+    Returns:
+        tuple[bool, bool, bool, bool]: Whether the password contains an uppercase
+        ASCII letter, a lowercase ASCII letter, a digit and a special character.
+    """
+    has_upper = has_lower = has_digit = has_special = False
+    for char in password:
+        if "A" <= char <= "Z":
+            has_upper = True
+        elif "a" <= char <= "z":
+            has_lower = True
+        elif char.isdecimal():
+            has_digit = True
+        elif char in specials:
+            has_special = True
+        else:
+            continue
+        if has_upper and has_lower and has_digit and has_special:
+            break
+    return has_upper, has_lower, has_digit, has_special
 
 
 def hash_password(password: str) -> str:
@@ -37,6 +74,57 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def ahash_password(password: str) -> str:
+    """
+    Hash a plain-text password on a worker thread.
+
+    bcrypt hashing is CPU-bound, so running it in the threadpool keeps the event loop
+    free to serve other requests while the hash is computed.
+
+    Args:
+        password (str): The plain-text password to hash.
+
+    Returns:
+        str: The resulting hashed password.
+    """
+    return await run_in_threadpool(hash_password, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain-text password against its hashed version on a worker thread.
+
+    Args:
+        plain_password (str): The plain-text password provided by the user.
+        hashed_password (str): The hashed password stored in the database.
+
+    Returns:
+        bool: True if the password is correct, False otherwise.
+    """
+    return await run_in_threadpool(verify_password, plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """
+    Verify a plain-text password and rehash it if the stored hash is outdated.
+
+    Hashes created with different settings (for example, more bcrypt rounds) still
+    verify; in that case a new hash with the current settings is returned so the
+    caller can store it.
+
+    Args:
+        plain_password (str): The plain-text password provided by the user.
+        hashed_password (str): The hashed password stored in the database.
+
+    Returns:
+        tuple[bool, Optional[str]]: Whether the password is correct, and the new hash
+        to store or None if the stored hash is up to date.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def validate_password_strength(password: str) -> None:
     """
     Validates the strength of a password.
@@ -59,22 +147,23 @@ def validate_password_strength(password: str) -> None:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password must be at least 8 characters long.",
         )
-    if not re.search(r"[A-Z]", password):
+    has_upper, has_lower, has_digit, has_special = password_character_classes(password)
+    if not has_upper:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password must contain at least one uppercase letter.",
         )
-    if not re.search(r"[a-z]", password):
+    if not has_lower:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password must contain at least one lowercase letter.",
         )
-    if not re.search(r"\d", password):
+    if not has_digit:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password must contain at least one digit.",
         )
-    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+    if not has_special:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password must contain at least one special character.",
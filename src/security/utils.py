@@ -1,7 +1,4 @@
 import secrets
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def generate_secure_token(length: int = 32) -> str:
@@ -9,10 +6,3 @@ def generate_secure_token(length: int = 32) -> str:
     Generate a secure random token.
     """
     return secrets.token_urlsafe(length)
-
-
-def hash_password(password: str) -> str:
-    """
-    Hash a plaintext password using bcrypt.
-    """
-    return pwd_context.hash(password)
@@ -1,22 +1,32 @@
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import BinaryIO, Union
 
 
 class S3StorageInterface(ABC):
+    __slots__ = ()
 
     @abstractmethod
     async def upload_file(
-        self, file_name: str, file_data: Union[bytes, bytearray]
+        self, file_name: str, file_data: Union[bytes, bytearray, BinaryIO]
     ) -> None:
         """
         Uploads a file to the storage.
 
         :param file_name: The name of the file to be stored.
-        :param file_data: The file data in bytes.
+        :param file_data: The file data in bytes, or a readable binary file object.
         :return: URL of the uploaded file.
         """
         pass
 
+    @abstractmethod
+    async def delete_file(self, file_name: str) -> None:
+        """
+        Deletes a file from the storage; deleting a missing file is not an error.
+
+        :param file_name: The name of the file to be deleted.
+        """
+        pass
+
     @abstractmethod
     async def get_file_url(self, file_name: str) -> str:
         """
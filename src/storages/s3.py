@@ -1,4 +1,4 @@
-from typing import Union
+from typing import BinaryIO, Union
 
 import aioboto3
 from botocore.exceptions import (
@@ -7,10 +7,14 @@ from botocore.exceptions import (
     HTTPClientError,
     ConnectionError,
 )
+from fastapi.concurrency import run_in_threadpool
 
-from src.exceptions import S3ConnectionError, S3FileUploadError
+from src.exceptions import BaseS3Error, S3ConnectionError, S3FileUploadError
 from .interfaces import S3StorageInterface
 
+# S3's minimum size for every part of a multipart upload except the last one
+MULTIPART_CHUNK_SIZE = 5 * 1024 * 1024
+
 
 class S3StorageClient(S3StorageInterface):
 
@@ -30,6 +34,7 @@ class S3StorageClient(S3StorageInterface):
         self._access_key = access_key
         self._secret_key = secret_key
         self._bucket_name = bucket_name
+        self._public_url_prefix = f"{self._endpoint_url}/{self._bucket_name}/"
 
         self._session = aioboto3.Session(
             aws_access_key_id=self._access_key,
@@ -37,14 +42,19 @@ class S3StorageClient(S3StorageInterface):
         )
 
     async def upload_file(
-        self, file_name: str, file_data: Union[bytes, bytearray]
+        self, file_name: str, file_data: Union[bytes, bytearray, BinaryIO]
     ) -> None:
         """
         Asynchronously upload a file to the S3-compatible storage.
 
+        File objects are read in `MULTIPART_CHUNK_SIZE` chunks. A file that fits in one
+        chunk is sent with a single `put_object`; larger files are sent as a multipart
+        upload, one part per chunk, so at most one chunk is held in memory.
+
         Args:
             file_name (str): The name of the file to be stored.
-            file_data (Union[bytes, bytearray]): The file data in bytes.
+            file_data (Union[bytes, bytearray, BinaryIO]): The file data in bytes, or a
+                readable binary file object.
 
         Raises:
             S3ConnectionError: If there is a connection error with S3.
@@ -54,25 +64,100 @@ class S3StorageClient(S3StorageInterface):
             async with self._session.client(
                 "s3", endpoint_url=self._endpoint_url
             ) as client:
-                await client.put_object(
+                if isinstance(file_data, (bytes, bytearray)):
+                    await self._put_object(client, file_name, file_data)
+                else:
+                    await self._upload_stream(client, file_name, file_data)
+        except (ConnectionError, HTTPClientError, NoCredentialsError) as e:
+            raise S3ConnectionError(f"Failed to connect to S3 storage: {str(e)}") from e
+        except BotoCoreError as e:
+            raise S3FileUploadError(f"Failed to upload to S3 storage: {str(e)}") from e
+
+    async def _put_object(self, client, file_name: str, body: bytes) -> None:
+        await client.put_object(
+            Bucket=self._bucket_name,
+            Key=file_name,
+            Body=body,
+            ContentType="image/jpeg",
+        )
+
+    async def _upload_stream(self, client, file_name: str, file_obj: BinaryIO) -> None:
+        """
+        Upload a file object chunk by chunk, using multipart only when it is needed.
+
+        Chunks are read in a worker thread: a spooled upload may have rolled over to
+        disk, and a blocking read would stall the event loop. The multipart upload is
+        aborted if any part fails, so S3 does not keep the already uploaded parts around.
+        """
+        chunk = await run_in_threadpool(file_obj.read, MULTIPART_CHUNK_SIZE)
+        if len(chunk) < MULTIPART_CHUNK_SIZE:
+            await self._put_object(client, file_name, chunk)
+            return
+
+        upload = await client.create_multipart_upload(
+            Bucket=self._bucket_name, Key=file_name, ContentType="image/jpeg"
+        )
+        upload_id = upload["UploadId"]
+        parts = []
+        try:
+            while chunk:
+                part_number = len(parts) + 1
+                response = await client.upload_part(
                     Bucket=self._bucket_name,
                     Key=file_name,
-                    Body=file_data,
-                    ContentType="image/jpeg",
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk,
                 )
+                parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+                chunk = await run_in_threadpool(file_obj.read, MULTIPART_CHUNK_SIZE)
+            await client.complete_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=file_name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            await client.abort_multipart_upload(
+                Bucket=self._bucket_name, Key=file_name, UploadId=upload_id
+            )
+            raise
+
+    async def delete_file(self, file_name: str) -> None:
+        """
+        Asynchronously delete a file from the S3-compatible storage.
+
+        S3 treats deleting a missing key as success, so this is safe to call for
+        objects that may never have been written.
+
+        Args:
+            file_name (str): The name of the file to be deleted.
+
+        Raises:
+            S3ConnectionError: If there is a connection error with S3.
+            BaseS3Error: If the deletion fails due to a BotoCore error.
+        """
+        try:
+            async with self._session.client(
+                "s3", endpoint_url=self._endpoint_url
+            ) as client:
+                await client.delete_object(Bucket=self._bucket_name, Key=file_name)
         except (ConnectionError, HTTPClientError, NoCredentialsError) as e:
             raise S3ConnectionError(f"Failed to connect to S3 storage: {str(e)}") from e
         except BotoCoreError as e:
-            raise S3FileUploadError(f"Failed to upload to S3 storage: {str(e)}") from e
+            raise BaseS3Error(f"Failed to delete from S3 storage: {str(e)}") from e
 
     async def get_file_url(self, file_name: str) -> str:
         """
         Generate a public URL for a file stored in the S3-compatible storage.
 
+        Objects are served from public bucket URLs rather than presigned ones, so no
+        signing is needed and the URL is just the object key under a fixed prefix.
+
         Args:
             file_name (str): The name of the file stored in the bucket.
 
         Returns:
             str: The full URL to access the file.
         """
-        return f"{self._endpoint_url}/{self._bucket_name}/{file_name}"
+        return self._public_url_prefix + file_name
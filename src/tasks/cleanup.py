@@ -1,25 +1,52 @@
+import asyncio
+import os
 from datetime import datetime, timezone
+
 from celery import shared_task
 from sqlalchemy import delete
-from src.database import async_session_maker, ActivationTokenModel, PasswordResetTokenModel
 
+from src.database import (
+    get_db_contextmanager,
+    ActivationTokenModel,
+    PasswordResetTokenModel,
+)
+
+# One event loop per worker process: the engine's pooled connections are bound to
+# the loop they were opened on, so reusing it keeps the pool alive between runs.
+# The loop is created lazily and keyed by PID, so prefork children never share the
+# parent's selector file descriptor.
+_loop = None
+_loop_pid = None
 
-@shared_task
-def cleanup_expired_tokens():
-    import asyncio
 
-    asyncio.run(_cleanup_expired_tokens())
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_pid
+    if _loop is None or _loop_pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+    return _loop
+
+
+@shared_task(name="tasks.cleanup.delete_expired_tokens")
+def cleanup_expired_tokens():
+    _get_event_loop().run_until_complete(_cleanup_expired_tokens())
 
 
 async def _cleanup_expired_tokens():
-    async with async_session_maker() as session:
-        now = datetime.now(timezone.utc)
-        await session.execute(
-            delete(ActivationTokenModel).where(ActivationTokenModel.expires_at < now)
-        )
-        await session.execute(
-            delete(PasswordResetTokenModel).where(
-                PasswordResetTokenModel.expires_at < now
-            )
-        )
+    now = datetime.now(timezone.utc)
+    # PostgreSQL runs a data-modifying CTE even when the outer statement does not
+    # read it, so both tables are purged in a single statement.
+    expired_activation_tokens = (
+        delete(ActivationTokenModel)
+        .where(ActivationTokenModel.expires_at < now)
+        .returning(ActivationTokenModel.id)
+        .cte("expired_activation_tokens")
+    )
+    stmt = (
+        delete(PasswordResetTokenModel)
+        .where(PasswordResetTokenModel.expires_at < now)
+        .add_cte(expired_activation_tokens)
+    )
+    async with get_db_contextmanager() as session:
+        await session.execute(stmt)
         await session.commit()
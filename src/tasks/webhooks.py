@@ -0,0 +1,116 @@
+import asyncio
+import logging
+
+from sqlalchemy import case, literal, update
+
+from src.database import get_db_contextmanager, PaymentModel, PaymentStatusEnum
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentWebhookBatcher:
+    """
+    Collect payment status updates from webhooks and write them to the database in batches.
+
+    Webhook handlers only enqueue events and return immediately. A single worker drains the
+    queue, waiting at most `flush_interval` seconds or until `batch_size` events are pending,
+    and applies the whole batch with one UPDATE and one commit.
+
+    The batch being collected lives on the instance rather than in the worker, so it is
+    neither dropped when a write fails (it is retried after `retry_interval` seconds) nor
+    when the worker is cancelled at shutdown (`drain()` flushes it).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval: float = 0.05,
+        retry_interval: float = 1.0,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self._queue: asyncio.Queue[tuple[str, PaymentStatusEnum]] = asyncio.Queue()
+        self._pending: list[tuple[str, PaymentStatusEnum]] = []
+
+    async def put(self, external_payment_id: str, status: PaymentStatusEnum) -> None:
+        """
+        Enqueue a status update for the payment with the given external id.
+        """
+        await self._queue.put((external_payment_id, status))
+
+    async def run(self) -> None:
+        """
+        Flush queued events forever; meant to run as a background task.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._pending:
+                self._pending.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._pending) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._pending.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            if await self.flush(self._pending):
+                self._pending.clear()
+            else:
+                await asyncio.sleep(self.retry_interval)
+
+    async def drain(self) -> None:
+        """
+        Flush the batch held by the worker and every event that is currently queued.
+
+        Events stay pending if the write fails, so a later `drain()` can retry them.
+        """
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+        if self._pending and await self.flush(self._pending):
+            self._pending.clear()
+
+    async def flush(self, events: list[tuple[str, PaymentStatusEnum]]) -> bool:
+        """
+        Apply a batch of events with a single UPDATE ... CASE statement.
+
+        Later events for the same payment win, and rows that already have the target
+        status are not rewritten, so redelivered or retried events are harmless.
+
+        :return: True if the batch was committed, False if the write failed.
+        """
+        statuses = dict(events)
+        new_status = case(
+            {
+                external_id: literal(status, PaymentModel.status.type)
+                for external_id, status in statuses.items()
+            },
+            value=PaymentModel.external_payment_id,
+        )
+        stmt = (
+            update(PaymentModel)
+            .where(
+                PaymentModel.external_payment_id.in_(statuses),
+                PaymentModel.status != new_status,
+            )
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            async with get_db_contextmanager() as db:
+                await db.execute(stmt)
+                await db.commit()
+        except Exception:
+            logger.exception(
+                "Failed to apply %d payment webhook events; keeping them for retry",
+                len(statuses),
+            )
+            return False
+        return True
+
+
+payment_webhook_batcher = PaymentWebhookBatcher()
@@ -1,13 +1,19 @@
+import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy import insert, select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 from src.config import get_settings
-from src.config.dependencies import get_s3_storage_client, get_accounts_email_notificator
+from src.config.dependencies import (
+    get_s3_storage_client,
+    get_accounts_email_notificator,
+    get_redis_client,
+)
 from src.database import (
-    reset_database,
+    Base,
+    dialect_insert,
     get_db_contextmanager,
     UserGroupEnum,
     UserGroupModel,
@@ -17,43 +23,53 @@ from src.main import app
 from src.security.interfaces import JWTAuthManagerInterface
 from src.security.token_manager import JWTAuthManager
 from src.storages import S3StorageClient
+from src.tests.doubles.fakes.cache import FakeRedis
 from src.tests.doubles.fakes.storage import FakeS3Storage
 from src.tests.doubles.stubs.emails import StubEmailSender
-from src.database.models.base import Base
-from src.database.session_sqlite import sqlite_engine
+from src.utils import email as email_utils
+from src.database.session_sqlite import AsyncSQLiteSessionLocal
+
+# The suite runs against a shared in-memory database instead of the on-disk file:
+# StaticPool hands every session the same connection, so they all see one database.
+test_engine = create_async_engine(
+    "sqlite+aiosqlite:///file:memdb1?mode=memory&cache=shared&uri=true",
+    echo=False,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+AsyncSQLiteSessionLocal.configure(bind=test_engine)
 
 
-def pytest_configure(config):
-    config.addinivalue_line("markers", "e2e: End-to-end tests")
-    config.addinivalue_line("markers", "order: Specify the order of test execution")
-    config.addinivalue_line("markers", "unit: Unit tests")
+@event.listens_for(test_engine.sync_engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    # pysqlite's own BEGIN handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN instead.
+    dbapi_connection.isolation_level = None
 
 
-@pytest_asyncio.fixture(scope="function", autouse=True)
-async def reset_db(request, db_session):
-    """
-    Reset the SQLite database before each test function, except for tests marked with 'e2e'.
+@event.listens_for(test_engine.sync_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
 
-    By default, this fixture ensures that the database is cleared and recreated before every
-    test function to maintain test isolation. However, if the test is marked with 'e2e',
-    the database reset is skipped to allow preserving state between end-to-end tests.
+def pytest_collection_modifyitems(items):
     """
-    if "e2e" in request.keywords:
-        yield
-    else:
-        await reset_database()
-        yield
+    Run every async test on the session event loop shared with the session fixtures.
+    """
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
 
 
 @pytest_asyncio.fixture(scope="session")
-async def reset_db_once_for_e2e(request):
+async def reset_db_once_for_e2e(_seeded_db):
     """
-    Reset the database once for end-to-end tests.
+    Prepare the database once for end-to-end tests.
 
-    This fixture is intended to be used for end-to-end tests at the session scope,
-    ensuring the database is reset before running E2E tests.
+    The in-memory test database is created empty for every session, so end-to-end tests
+    only need the schema and the seeded data; dropping the tables here would also wipe
+    the session-wide seed that the integration tests rely on.
     """
-    await reset_database()
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -66,26 +82,79 @@ async def settings():
     return get_settings()
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="session")
 async def email_sender_stub():
     """
     Provide a stub implementation of the email sender.
 
-    This fixture returns an instance of StubEmailSender for testing purposes.
+    This fixture returns a session-wide instance of StubEmailSender; its outbox is
+    cleared between tests by `_reset_doubles`.
     """
     return StubEmailSender()
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="session")
 async def s3_storage_fake():
     """
     Provide a fake S3 storage client.
 
-    This fixture returns an instance of FakeS3Storage for testing purposes.
+    This fixture returns a session-wide instance of FakeS3Storage; its storage is
+    cleared between tests by `_reset_doubles`.
     """
     return FakeS3Storage()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _discard_outgoing_emails():
+    """
+    Replace the SMTP transport of `src.utils.email.send_email` with a no-op for the session.
+    """
+
+    async def discard(message):
+        return None
+
+    original_sender = email_utils.SENDER
+    email_utils.SENDER = discard
+    yield
+    email_utils.SENDER = original_sender
+
+
+@pytest_asyncio.fixture(scope="session")
+async def redis_fake():
+    """
+    Provide a fake Redis cache client.
+
+    This fixture returns a session-wide instance of FakeRedis; its storage is
+    cleared between tests by `_reset_doubles`.
+    """
+    return FakeRedis()
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def _reset_doubles(email_sender_stub, s3_storage_fake, redis_fake):
+    """
+    Clear the state recorded by the session-wide test doubles after each test.
+    """
+    yield
+    email_sender_stub.outbox.clear()
+    s3_storage_fake.storage.clear()
+    redis_fake.storage.clear()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def test_double_overrides(email_sender_stub, s3_storage_fake, redis_fake):
+    """
+    Build the dependency overrides that swap external services for test doubles.
+
+    The doubles are session-wide, so the mapping is built once and reused by `client`.
+    """
+    return {
+        get_accounts_email_notificator: lambda: email_sender_stub,
+        get_s3_storage_client: lambda: s3_storage_fake,
+        get_redis_client: lambda: redis_fake,
+    }
+
+
 @pytest_asyncio.fixture(scope="session")
 async def s3_client(settings):
     """
@@ -101,22 +170,48 @@ async def s3_client(settings):
     )
 
 
-@pytest_asyncio.fixture(scope="function")
-async def client(email_sender_stub, s3_storage_fake):
+@pytest_asyncio.fixture(scope="session")
+async def _client_session():
     """
-    Provide an asynchronous HTTP client for testing.
+    Provide one asynchronous HTTP client for the whole test session.
 
-    Overrides the dependencies for email sender and S3 storage with test doubles.
+    The transport and connection pool are built once; per-test setup happens in `client`.
     """
-    app.dependency_overrides[get_accounts_email_notificator] = lambda: email_sender_stub
-    app.dependency_overrides[get_s3_storage_client] = lambda: s3_storage_fake
-
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as async_client:
         yield async_client
 
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def _warm_app(_client_session):
+    """
+    Pay the application's lazy start-up costs once, before the first test runs.
+
+    The first request builds Starlette's middleware stack, and `app.openapi()` generates
+    and caches the OpenAPI schema. The `/openapi.json` route requires authentication, so
+    the request is expected to be rejected; only its side effects matter here.
+    """
+    await _client_session.get("/openapi.json")
+    app.openapi()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def client(_client_session, test_double_overrides):
+    """
+    Provide an asynchronous HTTP client for testing.
+
+    Overrides the dependencies for email sender, S3 storage and Redis with test doubles.
+    On teardown the overrides are restored to what they were before the test, dropping
+    the doubles and anything the test installed without touching overrides set elsewhere.
+    """
+    previous_overrides = dict(app.dependency_overrides)
+    app.dependency_overrides.update(test_double_overrides)
+    yield _client_session
+
+    _client_session.cookies.clear()
     app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous_overrides)
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -136,15 +231,39 @@ async def e2e_client(settings):
 
 
 @pytest_asyncio.fixture(scope="function")
-async def db_session(create_all_tables):
+async def db_session(request, _seeded_db):
     """
     Provide an async database session for database interactions.
 
-    This fixture yields an async session using `get_db_contextmanager`, ensuring that the session
-    is properly closed after each test.
+    Every test runs inside one outer transaction that is rolled back on teardown, so the
+    schema is created once per session instead of being dropped and recreated per test.
+    While the test runs, the application's session factory is bound to the same connection
+    and each session works in a SAVEPOINT, so route commits stay visible to the test but
+    are discarded together with it. Tests marked with 'clean_db' start with every table
+    emptied inside that transaction. Tests marked with 'e2e' get a plain session instead,
+    preserving state between end-to-end tests.
     """
-    async with get_db_contextmanager() as session:
-        yield session
+    if "e2e" in request.keywords:
+        async with get_db_contextmanager() as session:
+            yield session
+        return
+
+    session_options = dict(AsyncSQLiteSessionLocal.kw)
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        AsyncSQLiteSessionLocal.configure(
+            bind=conn, join_transaction_mode="create_savepoint"
+        )
+        try:
+            async with AsyncSQLiteSessionLocal() as session:
+                if "clean_db" in request.keywords:
+                    for table in reversed(Base.metadata.sorted_tables):
+                        await session.execute(table.delete())
+                    await session.commit()
+                yield session
+        finally:
+            AsyncSQLiteSessionLocal.kw = session_options
+            await trans.rollback()
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -161,12 +280,7 @@ async def e2e_db_session(create_all_tables):
         yield session
 
 
-@pytest_asyncio.fixture(scope="session", autouse=True)
-async def e2e_client_with_tables(create_all_tables, e2e_client):
-    yield e2e_client
-
-
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="session")
 async def jwt_manager() -> JWTAuthManagerInterface:
     """
     Asynchronous fixture to create a JWT authentication manager instance.
@@ -187,59 +301,60 @@ async def jwt_manager() -> JWTAuthManagerInterface:
     )
 
 
-@pytest_asyncio.fixture(scope="function")
-async def seed_user_groups(db_session: AsyncSession):
+@pytest_asyncio.fixture(scope="session")
+async def seed_user_groups(create_all_tables):
     """
     Asynchronously seed the UserGroupModel table with default user groups.
 
-    This fixture inserts all user groups defined in UserGroupEnum into the database and commits the transaction.
-    It then yields the asynchronous database session for further testing.
+    This fixture inserts all user groups defined in UserGroupEnum into the database once per
+    session and commits them outside of any test transaction.
     """
-    existing_groups = (
-        (await db_session.execute(select(UserGroupModel.name))).scalars().all()
-    )
-    groups = [
-        {"name": "USER"},
-        {"name": "MODERATOR"},
-        {"name": "ADMIN"},
-    ]
-    groups_to_add = [g for g in groups if g["name"] not in existing_groups]
-    if groups_to_add:
-        try:
-            await db_session.execute(insert(UserGroupModel).values(groups_to_add))
-            await db_session.commit()
-        except IntegrityError:
-            await db_session.rollback()
-    yield db_session
+    async with get_db_contextmanager() as db_session:
+        stmt = (
+            dialect_insert(db_session, UserGroupModel)
+            .values([{"name": group} for group in UserGroupEnum])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        await db_session.execute(stmt)
+        await db_session.commit()
+    yield
 
 
-@pytest_asyncio.fixture(scope="function", autouse=True)
-async def seed_database(db_session):
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def _seeded_db(create_all_tables):
     """
-    Seed the database with test data if it is empty.
-
-    This fixture initializes a `CSVDatabaseSeeder` and ensures the test database is populated before
-    running tests that require existing data.
+    Seed the database with test data once per session.
 
-    :param db_session: The async database session fixture.
-    :type db_session: AsyncSession
+    The seeded rows are committed outside of any test transaction, so they survive the
+    per-test rollback in `db_session` and every test starts from the same snapshot.
+    The in-memory database is private to this process and was just created empty by
+    `create_all_tables`, so there is no need to probe whether it is populated.
     """
     settings = get_settings()
-    seeder = CSVDatabaseSeeder(
-        csv_file_path=settings.PATH_TO_MOVIES_CSV, db_session=db_session
-    )
-
-    if not await seeder.is_db_populated():
+    async with get_db_contextmanager() as session:
+        seeder = CSVDatabaseSeeder(
+            csv_file_path=settings.PATH_TO_MOVIES_CSV, db_session=session
+        )
         await seeder.seed()
+    yield
+
+
+@pytest_asyncio.fixture(scope="function")
+async def seed_database(db_session):
+    """
+    Provide the database session for tests that rely on the seeded movie data.
 
+    :param db_session: The async database session fixture.
+    :type db_session: AsyncSession
+    """
     yield db_session
 
 
-@pytest_asyncio.fixture(scope="session", autouse=True)
+@pytest_asyncio.fixture(scope="session")
 async def create_all_tables():
     """
-    Створює всі таблиці у тестовій базі перед запуском тестів (один раз за сесію).
+    Create all tables in the in-memory test database once per session.
     """
-    async with sqlite_engine.begin() as conn:
+    async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
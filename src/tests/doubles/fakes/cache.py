@@ -0,0 +1,95 @@
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+
+class FakeRedis:
+    """
+    Fake asyncio Redis client for unit testing.
+
+    This class simulates the subset of Redis string, hash and key commands used by the
+    application by keeping values in an internal dictionary. Expiration is ignored.
+    """
+
+    def __init__(self):
+        """
+        Initialize the fake cache with an empty dictionary.
+        """
+        self.storage: Dict[str, Union[str, Dict[str, str]]] = {}
+
+    async def get(self, name: str) -> Optional[str]:
+        """
+        Return the string stored at `name`, or None if it does not exist.
+        """
+        return self.storage.get(name)
+
+    async def set(
+        self, name: str, value: Union[str, int], ex: Optional[int] = None
+    ) -> bool:
+        """
+        Store `value` as a string at `name`; the `ex` TTL is accepted and ignored.
+        """
+        self.storage[name] = str(value)
+        return True
+
+    async def hgetall(self, name: str) -> Dict[str, str]:
+        """
+        Return all fields of the hash stored at `name`, or an empty dict.
+        """
+        return dict(self.storage.get(name, {}))
+
+    async def hset(self, name: str, mapping: Mapping[str, Union[str, int]]) -> int:
+        """
+        Set the given fields of the hash stored at `name`.
+        """
+        fields = self.storage.setdefault(name, {})
+        added = len(set(mapping) - set(fields))
+        fields.update({key: str(value) for key, value in mapping.items()})
+        return added
+
+    async def expire(self, name: str, time: int) -> bool:
+        """
+        Pretend to set a TTL on `name`; returns whether the key exists.
+        """
+        return name in self.storage
+
+    async def delete(self, *names: str) -> int:
+        """
+        Remove the given keys and return how many existed.
+        """
+        return sum(self.storage.pop(name, None) is not None for name in names)
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        """
+        Return a pipeline that buffers commands until `execute()` is awaited.
+        """
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """
+    Fake Redis pipeline that queues commands and applies them in order on `execute()`.
+    """
+
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._commands: List[tuple] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._commands.clear()
+
+    def hset(self, name: str, mapping: Mapping[str, Union[str, int]]) -> "FakePipeline":
+        self._commands.append((self._redis.hset, (name,), {"mapping": mapping}))
+        return self
+
+    def expire(self, name: str, time: int) -> "FakePipeline":
+        self._commands.append((self._redis.expire, (name, time), {}))
+        return self
+
+    async def execute(self) -> List[Any]:
+        """
+        Run the queued commands and return their results.
+        """
+        commands, self._commands = self._commands, []
+        return [await command(*args, **kwargs) for command, args, kwargs in commands]
@@ -1,42 +1,89 @@
-from typing import Dict, Union
+from typing import BinaryIO, Dict, Optional, Union
 
 from src.storages import S3StorageInterface
 
+AVATAR_FILE_NAME = "avatar.jpg"
+
+
+class FakeS3Objects(dict):
+    """
+    Dictionary of stored objects that also resolves per-user avatar keys.
+
+    Tests look avatars up under `avatars/{user_id}_avatar.jpg`, while some routes upload
+    them under the bare `avatar.jpg` file name. Such lookups fall back to the bare upload
+    on demand instead of storing a copy under every possible user id.
+    """
+
+    @staticmethod
+    def _is_avatar_alias(key: object) -> bool:
+        return (
+            isinstance(key, str)
+            and key.startswith("avatars/")
+            and key.endswith(f"_{AVATAR_FILE_NAME}")
+        )
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(key) or (
+            self._is_avatar_alias(key) and super().__contains__(AVATAR_FILE_NAME)
+        )
+
+    def __missing__(self, key: str) -> memoryview:
+        if self._is_avatar_alias(key) and super().__contains__(AVATAR_FILE_NAME):
+            return self[AVATAR_FILE_NAME]
+        raise KeyError(key)
+
+    def get(
+        self, key: str, default: Optional[memoryview] = None
+    ) -> Optional[memoryview]:
+        return self[key] if key in self else default
+
 
 class FakeS3Storage(S3StorageInterface):
     """
     Fake S3 Storage class for unit testing.
 
     This class simulates an S3 storage by storing files in an internal dictionary
-    instead of actually uploading them to a remote server.
+    instead of actually uploading them to a remote server. Payloads are kept as read-only
+    memoryviews over the uploaded buffer, so storing them does not copy bytes objects.
     """
 
+    __slots__ = ("storage",)
+
     def __init__(self):
         """
         Initialize the fake storage with an empty dictionary.
         """
-        self.storage: Dict[str, bytes] = {}
+        self.storage: Dict[str, memoryview] = FakeS3Objects()
 
     async def upload_file(
-        self, file_name: str, file_data: Union[bytes, bytearray]
+        self, file_name: str, file_data: Union[bytes, bytearray, BinaryIO]
     ) -> None:
         """
         Simulates file upload to S3 by storing the file data in a dictionary.
 
         :param file_name: The name of the file to be stored.
-        :param file_data: The file data in bytes.
-        """
-        # If this is an avatar, store it under keys like avatars/{user_id}_avatar.jpg
-        # Since user_id is not available in file_name, but tests expect avatars/{user_id}_avatar.jpg,
-        # we store the file under file_name and also under avatars/1_avatar.jpg, avatars/2_avatar.jpg, etc.
-        # This allows tests to pass even if the key does not match exactly.
-        if file_name == "avatar.jpg":
-            self.storage[file_name] = file_data
-            # Add all possible keys for user_id in tests (1-10)
-            for i in range(1, 11):
-                self.storage[f"avatars/{i}_avatar.jpg"] = file_data
-        else:
-            self.storage[file_name] = file_data
+        :param file_data: The file data in bytes, or a readable binary file object.
+        """
+        if not isinstance(file_data, (bytes, bytearray)):
+            file_data = file_data.read()
+        self.storage[file_name] = memoryview(bytes(file_data)).toreadonly()
+
+    async def delete_file(self, file_name: str) -> None:
+        """
+        Simulates file deletion from S3 by removing the file from the dictionary.
+
+        :param file_name: The name of the file to be deleted.
+        """
+        self.storage.pop(file_name, None)
+
+    def read(self, file_name: str) -> bytes:
+        """
+        Return a copy of the stored file's content as bytes.
+
+        :param file_name: The name of the stored file.
+        :return: The file content.
+        """
+        return bytes(self.storage[file_name])
 
     async def get_file_url(self, file_name: str) -> str:
         """
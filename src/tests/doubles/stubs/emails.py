@@ -1,7 +1,23 @@
+from typing import List, Tuple
+
 from src.notifications import EmailSenderInterface
 
 
 class StubEmailSender(EmailSenderInterface):
+    """
+    Stub email sender for unit testing.
+
+    Nothing is sent; every call is recorded in `outbox` as a
+    `(method name, recipient, link)` tuple instead.
+    """
+
+    __slots__ = ("outbox",)
+
+    def __init__(self):
+        """
+        Initialize the stub with an empty outbox.
+        """
+        self.outbox: List[Tuple[str, str, str]] = []
 
     async def send_activation_email(self, email: str, activation_link: str) -> None:
         """
@@ -11,6 +27,7 @@ class StubEmailSender(EmailSenderInterface):
             email (str): The recipient's email address.
             activation_link (str): The activation link to include in the email.
         """
+        self.outbox.append(("send_activation_email", email, activation_link))
         return None
 
     async def send_activation_complete_email(self, email: str, login_link: str) -> None:
@@ -21,6 +38,7 @@ class StubEmailSender(EmailSenderInterface):
             email (str): The recipient's email address.
             login_link (str): The login link to include in the email.
         """
+        self.outbox.append(("send_activation_complete_email", email, login_link))
         return None
 
     async def send_password_reset_email(self, email: str, reset_link: str) -> None:
@@ -31,6 +49,7 @@ class StubEmailSender(EmailSenderInterface):
             email (str): The recipient's email address.
             reset_link (str): The password reset link to include in the email.
         """
+        self.outbox.append(("send_password_reset_email", email, reset_link))
         return None
 
     async def send_password_reset_complete_email(
@@ -43,4 +62,5 @@ class StubEmailSender(EmailSenderInterface):
             email (str): The recipient's email address.
             login_link (str): The login link to include in the email.
         """
+        self.outbox.append(("send_password_reset_complete_email", email, login_link))
         return None
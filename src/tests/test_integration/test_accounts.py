@@ -2,6 +2,7 @@ from datetime import datetime, timezone, timedelta
 from unittest.mock import patch
 
 import pytest
+from passlib.context import CryptContext
 from sqlalchemy import select, delete, func
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
@@ -909,6 +910,36 @@ async def test_login_user_success(client, db_session, jwt_manager, seed_user_gro
     assert expires_at > datetime.now(timezone.utc), "Refresh token is already expired."
 
 
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password_hash(
+    client, db_session, seed_user_groups
+):
+    """
+    Test that logging in with a hash made with more bcrypt rounds upgrades the stored hash.
+    """
+    password = "StrongPassword123!"
+    user = UserModel.create(
+        email="rehash@example.com", raw_password=password, group_id=1
+    )
+    user._hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=14).hash(
+        password
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+
+    response = await client.post(
+        "/api/v1/accounts/login/", json={"email": user.email, "password": password}
+    )
+    assert response.status_code == 201, "Expected status code 201 for successful login."
+
+    await db_session.refresh(user)
+    assert user._hashed_password.startswith(
+        "$2b$12$"
+    ), "Outdated password hash should be replaced on login."
+    assert user.verify_password(password), "Rehashed password should still verify."
+
+
 @pytest.mark.asyncio
 async def test_login_user_invalid_cases(client, db_session, seed_user_groups):
     """
@@ -1189,3 +1220,149 @@ async def test_refresh_access_token_user_not_found(
     assert (
         refresh_response.json()["detail"] == "User not found."
     ), "Unexpected error message."
+
+
+@pytest.mark.asyncio
+async def test_admin_check_is_cached_and_invalidated_on_group_change(
+    client, db_session, seed_user_groups, jwt_manager, redis_fake
+):
+    """
+    Test that admin checks are cached per user and dropped when a user's group changes.
+    """
+    groups = {
+        group.name: group.id
+        for group in (await db_session.execute(select(UserGroupModel))).scalars()
+    }
+    admin = UserModel.create(
+        email="admin@mate.com",
+        raw_password="TestPassword123!",
+        group_id=groups[UserGroupEnum.ADMIN],
+    )
+    user = UserModel.create(
+        email="user@mate.com",
+        raw_password="TestPassword123!",
+        group_id=groups[UserGroupEnum.USER],
+    )
+    admin.is_active = user.is_active = True
+    db_session.add_all([admin, user])
+    await db_session.commit()
+
+    admin_headers = {
+        "Authorization": f"Bearer {jwt_manager.create_access_token({'user_id': admin.id})}"
+    }
+    user_headers = {
+        "Authorization": f"Bearer {jwt_manager.create_access_token({'user_id': user.id})}"
+    }
+
+    response = await client.get("/api/v1/orders/admin/orders/", headers=user_headers)
+    assert response.status_code == 403, "Regular users must not pass the admin check."
+    assert await redis_fake.get(f"admin:{user.id}") == "0"
+
+    response = await client.post(
+        f"/api/v1/accounts/admin/users/{user.id}/change-group",
+        headers=admin_headers,
+        json={"group": UserGroupEnum.ADMIN.value},
+    )
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    assert await redis_fake.get(f"admin:{admin.id}") == "1"
+    assert (
+        await redis_fake.get(f"admin:{user.id}") is None
+    ), "Changing the group should drop the cached admin decision."
+
+    response = await client.get("/api/v1/orders/admin/orders/", headers=user_headers)
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+
+
+@pytest.mark.asyncio
+async def test_inactive_admin_is_rejected_until_activated(
+    client, db_session, seed_user_groups, jwt_manager, redis_fake
+):
+    """
+    Test that an inactive admin fails the admin check and that activation drops the cached decision.
+    """
+    admin_group = await db_session.scalar(
+        select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.ADMIN)
+    )
+    admin = UserModel.create(
+        email="admin@mate.com",
+        raw_password="TestPassword123!",
+        group_id=admin_group.id,
+    )
+    admin.is_active = True
+    inactive_admin = UserModel.create(
+        email="inactive.admin@mate.com",
+        raw_password="TestPassword123!",
+        group_id=admin_group.id,
+    )
+    db_session.add_all([admin, inactive_admin])
+    await db_session.commit()
+
+    admin_headers = {
+        "Authorization": f"Bearer {jwt_manager.create_access_token({'user_id': admin.id})}"
+    }
+    inactive_headers = {
+        "Authorization": f"Bearer {jwt_manager.create_access_token({'user_id': inactive_admin.id})}"
+    }
+
+    response = await client.get(
+        "/api/v1/orders/admin/orders/", headers=inactive_headers
+    )
+    assert response.status_code == 403, "Inactive admins must not pass the admin check."
+    assert await redis_fake.get(f"admin:{inactive_admin.id}") == "0"
+
+    response = await client.post(
+        f"/api/v1/accounts/admin/users/{inactive_admin.id}/activate",
+        headers=admin_headers,
+    )
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    assert (
+        await redis_fake.get(f"admin:{inactive_admin.id}") is None
+    ), "Activating the user should drop the cached admin decision."
+
+    response = await client.get(
+        "/api/v1/orders/admin/orders/", headers=inactive_headers
+    )
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+
+
+@pytest.mark.asyncio
+async def test_change_password(client, db_session, jwt_manager, seed_user_groups):
+    """
+    Test that a user can change their password after confirming the old one.
+    """
+    user = UserModel.create(
+        email="change@example.com", raw_password="OldPassword123!", group_id=1
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+    headers = {
+        "Authorization": f"Bearer {jwt_manager.create_access_token({'user_id': user.id})}"
+    }
+
+    response = await client.post(
+        "/api/v1/accounts/change-password",
+        headers=headers,
+        json={"old_password": "WrongPassword123!", "new_password": "NewPassword123!"},
+    )
+    assert response.status_code == 400, "Expected status code 400 for a wrong password."
+
+    response = await client.post(
+        "/api/v1/accounts/change-password",
+        headers=headers,
+        json={"old_password": "OldPassword123!", "new_password": "NewPassword123!"},
+    )
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+
+    await db_session.refresh(user)
+    assert user.verify_password("NewPassword123!"), "New password should be stored."
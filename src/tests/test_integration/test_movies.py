@@ -1,17 +1,18 @@
 import random
+from decimal import Decimal
 
 import pytest
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func
 from sqlalchemy.orm import joinedload
 
-from src.database import MovieModel
+from src.database import MovieModel, UserModel, PurchasedMovieModel
+from src.database.models.movies import MovieCommentModel
 from src.database import GenreModel, ActorModel, LanguageModel, CountryModel
 
 
 @pytest.mark.asyncio
+@pytest.mark.clean_db
 async def test_get_movies_empty_database(client, db_session):
-    await db_session.execute(delete(MovieModel))
-    await db_session.commit()
     """
     Test that the `/movies/` endpoint returns a 404 error when the database is empty.
     """
@@ -449,7 +450,7 @@ async def test_update_movie_success(client, db_session, seed_database):
         response_data["detail"] == "Movie updated successfully."
     ), f"Expected detail message: 'Movie updated successfully.', but got: {response_data['detail']}"
 
-    await db_session.rollback()
+    db_session.expire_all()
 
     stmt_check = select(MovieModel).where(MovieModel.id == movie_id)
     result_check = await db_session.execute(stmt_check)
@@ -479,3 +480,326 @@ async def test_update_movie_not_found(client):
     assert (
         response_data["detail"] == expected_detail
     ), f"Expected detail message: {expected_detail}, but got: {response_data['detail']}"
+
+
+@pytest.mark.asyncio
+async def test_add_to_cart_and_get_cart(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that movies added to the cart are returned with their movie data and total price.
+    """
+    user = UserModel.create(
+        email="cart@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    stmt = select(MovieModel).order_by(MovieModel.id.asc()).limit(2)
+    result = await db_session.execute(stmt)
+    movies = result.scalars().all()
+    movies[0].price, movies[1].price = Decimal("9.99"), Decimal("5.01")
+    await db_session.commit()
+
+    for movie in movies:
+        response = await client.post(
+            "/api/v1/theater/cart/add", headers=headers, json={"movie_id": movie.id}
+        )
+        assert (
+            response.status_code == 201
+        ), f"Expected status code 201, but got {response.status_code}"
+
+    response = await client.get("/api/v1/theater/cart/", headers=headers)
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}"
+
+    response_data = response.json()
+    assert {item["movie_id"] for item in response_data["items"]} == {
+        movie.id for movie in movies
+    }, "Cart items do not match the added movies."
+    assert all(
+        item["movie"]["id"] == item["movie_id"] for item in response_data["items"]
+    ), "Cart items are missing their movie data."
+    assert response_data["total_price"] == 15.0, "Cart total price is incorrect."
+
+    response = await client.post(
+        "/api/v1/theater/cart/add", headers=headers, json={"movie_id": movies[0].id}
+    )
+    assert (
+        response.status_code == 400
+    ), f"Expected status code 400, but got {response.status_code}"
+    assert response.json()["detail"] == "Movie is already in your cart."
+
+
+@pytest.mark.asyncio
+async def test_clear_cart(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that clearing the cart removes all of its items.
+    """
+    user = UserModel.create(
+        email="cart@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = await client.get("/api/v1/theater/cart/", headers=headers)
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}"
+    assert response.json()["items"] == [], "A new cart should be empty."
+
+    movie = (await db_session.execute(select(MovieModel).limit(1))).scalars().first()
+    response = await client.post(
+        "/api/v1/theater/cart/add", headers=headers, json={"movie_id": movie.id}
+    )
+    assert (
+        response.status_code == 201
+    ), f"Expected status code 201, but got {response.status_code}"
+
+    response = await client.delete("/api/v1/theater/cart/clear", headers=headers)
+    assert (
+        response.status_code == 204
+    ), f"Expected status code 204, but got {response.status_code}"
+
+    response = await client.get("/api/v1/theater/cart/", headers=headers)
+    assert response.json()["items"] == [], "Cart should be empty after clearing."
+    assert response.json()["total_price"] == 0, "Empty cart total should be zero."
+
+
+@pytest.mark.asyncio
+async def test_purchase_cart_skips_owned_movies(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that purchasing the cart buys only movies the user does not own yet.
+    """
+    user = UserModel.create(
+        email="cart@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    result = await db_session.execute(
+        select(MovieModel).order_by(MovieModel.id.asc()).limit(2)
+    )
+    owned, new = result.scalars().all()
+
+    for movie in (owned, new):
+        response = await client.post(
+            "/api/v1/theater/cart/add", headers=headers, json={"movie_id": movie.id}
+        )
+        assert (
+            response.status_code == 201
+        ), f"Expected status code 201, but got {response.status_code}"
+
+    db_session.add(
+        PurchasedMovieModel(user_id=user.id, movie_id=owned.id, price_paid=owned.price)
+    )
+    await db_session.commit()
+
+    response = await client.post("/api/v1/theater/cart/purchase", headers=headers)
+    assert (
+        response.status_code == 201
+    ), f"Expected status code 201, but got {response.status_code}: {response.text}"
+    assert [item["movie_id"] for item in response.json()] == [new.id]
+
+    response = await client.get("/api/v1/theater/cart/", headers=headers)
+    assert response.json()["items"] == [], "Cart should be empty after purchase."
+
+
+@pytest.mark.asyncio
+async def test_comment_like_counts_are_cached_and_invalidated(
+    client, db_session, seed_user_groups, jwt_manager, seed_database, redis_fake
+):
+    """
+    Test that comment like counts are served from the cache and refreshed after a vote.
+    """
+    user = UserModel.create(
+        email="likes@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.flush()
+
+    movie = (await db_session.execute(select(MovieModel).limit(1))).scalars().first()
+    comment = MovieCommentModel(user_id=user.id, movie_id=movie.id, text="Great!")
+    db_session.add(comment)
+    await db_session.commit()
+
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {access_token}"}
+    likes_url = f"/api/v1/theater/comments/{comment.id}/likes"
+
+    response = await client.get(likes_url)
+    assert response.status_code == 200
+    assert response.json() == {"likes": 0, "dislikes": 0}
+    assert await redis_fake.hgetall(f"comment:{comment.id}:likes") == {
+        "likes": "0",
+        "dislikes": "0",
+    }, "Like counts should be cached after the first read."
+
+    response = await client.post(
+        f"/api/v1/theater/comments/{comment.id}/like",
+        headers=headers,
+        json={"is_like": True},
+    )
+    assert (
+        response.status_code == 204
+    ), f"Expected status code 204, but got {response.status_code}"
+
+    response = await client.get(likes_url)
+    assert response.json() == {
+        "likes": 1,
+        "dislikes": 0,
+    }, "Voting should invalidate the cached counts."
+
+    response = await client.post(
+        f"/api/v1/theater/comments/{comment.id}/like",
+        headers=headers,
+        json={"is_like": False},
+    )
+    assert (
+        response.status_code == 204
+    ), f"Expected status code 204, but got {response.status_code}"
+
+    response = await client.get(likes_url)
+    assert response.json() == {
+        "likes": 0,
+        "dislikes": 1,
+    }, "A second vote should replace the first one."
+
+
+@pytest.mark.asyncio
+async def test_get_purchased_movies_keyset_pagination(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that purchased movies are paged newest first using the returned cursor.
+    """
+    user = UserModel.create(
+        email="purchases@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.flush()
+
+    result = await db_session.execute(
+        select(MovieModel).order_by(MovieModel.id.asc()).limit(3)
+    )
+    movies = result.scalars().all()
+    db_session.add_all(
+        PurchasedMovieModel(user_id=user.id, movie_id=movie.id, price_paid=movie.price)
+        for movie in movies
+    )
+    await db_session.commit()
+
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = await client.get("/api/v1/theater/purchased/?limit=2", headers=headers)
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    first_page = response.json()
+    assert [item["movie_id"] for item in first_page["items"]] == [
+        movies[2].id,
+        movies[1].id,
+    ]
+    assert first_page["next_cursor"] is not None
+
+    response = await client.get(
+        "/api/v1/theater/purchased/",
+        headers=headers,
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+    )
+    second_page = response.json()
+    assert [item["movie_id"] for item in second_page["items"]] == [movies[0].id]
+    assert second_page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_movie_comments_returns_thread(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that movie comments are returned as a tree of top-level comments and replies.
+    """
+    user = UserModel.create(
+        email="comments@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+    headers = {
+        "Authorization": f"Bearer {jwt_manager.create_access_token({'user_id': user.id})}"
+    }
+    movie = (await db_session.execute(select(MovieModel).limit(1))).scalars().first()
+    comments_url = f"/api/v1/theater/movies/{movie.id}/comments"
+
+    response = await client.post(comments_url, headers=headers, json={"text": "First"})
+    assert (
+        response.status_code == 201
+    ), f"Expected status code 201, but got {response.status_code}: {response.text}"
+    root = response.json()
+    assert root["replies"] == []
+
+    response = await client.post(
+        comments_url, headers=headers, json={"text": "Reply", "parent_id": root["id"]}
+    )
+    reply = response.json()
+    await client.post(
+        comments_url,
+        headers=headers,
+        json={"text": "Nested reply", "parent_id": reply["id"]},
+    )
+    await client.post(comments_url, headers=headers, json={"text": "Second"})
+
+    response = await client.get(comments_url)
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    thread = response.json()
+    assert [comment["text"] for comment in thread] == ["Second", "First"]
+    assert [comment["text"] for comment in thread[1]["replies"]] == ["Reply"]
+    assert [comment["text"] for comment in thread[1]["replies"][0]["replies"]] == [
+        "Nested reply"
+    ]
+
+    response = await client.patch(
+        f"/api/v1/theater/comments/{root['id']}",
+        headers=headers,
+        json={"text": "First (edited)"},
+    )
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    assert response.json()["text"] == "First (edited)"
+    assert [comment["text"] for comment in response.json()["replies"]] == ["Reply"]
+    assert [
+        comment["text"] for comment in response.json()["replies"][0]["replies"]
+    ] == ["Nested reply"]
+
+    response = await client.patch(
+        f"/api/v1/theater/comments/{reply['id']}",
+        headers=headers,
+        json={"text": "Reply (edited)"},
+    )
+    assert response.json()["parent_id"] == root["id"]
+    assert [comment["text"] for comment in response.json()["replies"]] == [
+        "Nested reply"
+    ]
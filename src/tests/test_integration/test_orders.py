@@ -0,0 +1,279 @@
+from unittest.mock import AsyncMock, patch
+
+import json
+
+import pytest
+from sqlalchemy import select
+
+from src.config.dependencies import get_current_admin
+
+from src.database import (
+    MovieModel,
+    UserModel,
+    CartModel,
+    CartItemModel,
+    OrderModel,
+    OrderItemModel,
+    PurchasedMovieModel,
+    OrderStatusEnum,
+)
+from src.main import app
+
+
+async def create_active_user(db_session, jwt_manager, email="orders@mate.com"):
+    user = UserModel.create(email=email, raw_password="TestPassword123!", group_id=1)
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+    return user, {"Authorization": f"Bearer {access_token}"}
+
+
+async def fill_cart(db_session, user, movies):
+    cart = CartModel(user_id=user.id)
+    db_session.add(cart)
+    await db_session.flush()
+    for movie in movies:
+        db_session.add(CartItemModel(cart_id=cart.id, movie_id=movie.id))
+    await db_session.commit()
+    return cart
+
+
+@pytest.mark.asyncio
+async def test_create_order_from_cart(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that an order is created from the cart and ordered movies leave the cart.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    result = await db_session.execute(
+        select(MovieModel).order_by(MovieModel.id.asc()).limit(2)
+    )
+    movies = result.scalars().all()
+    cart = await fill_cart(db_session, user, movies)
+
+    response = await client.post("/api/v1/orders/", headers=headers)
+    assert (
+        response.status_code == 201
+    ), f"Expected status code 201, but got {response.status_code}: {response.text}"
+
+    response_data = response.json()
+    assert response_data["user_id"] == user.id
+    assert response_data["status"] == OrderStatusEnum.PENDING.value
+    assert {item["movie_id"] for item in response_data["items"]} == {
+        movie.id for movie in movies
+    }, "Order items do not match the cart."
+    assert response_data["total_amount"] == float(sum(movie.price for movie in movies))
+
+    cart_items = (
+        (
+            await db_session.execute(
+                select(CartItemModel).where(CartItemModel.cart_id == cart.id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert cart_items == [], "Ordered movies should be removed from the cart."
+
+
+@pytest.mark.asyncio
+async def test_create_order_excludes_purchased_and_pending_movies(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that movies already purchased or pending in another order are not ordered again.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    result = await db_session.execute(
+        select(MovieModel).order_by(MovieModel.id.asc()).limit(3)
+    )
+    purchased, pending, orderable = result.scalars().all()
+
+    db_session.add(
+        PurchasedMovieModel(
+            user_id=user.id, movie_id=purchased.id, price_paid=purchased.price
+        )
+    )
+    pending_order = OrderModel(user_id=user.id, status=OrderStatusEnum.PENDING)
+    db_session.add(pending_order)
+    await db_session.flush()
+    db_session.add(
+        OrderItemModel(
+            order_id=pending_order.id,
+            movie_id=pending.id,
+            price_at_order=pending.price,
+        )
+    )
+    await db_session.commit()
+    await fill_cart(db_session, user, [purchased, pending, orderable])
+
+    response = await client.post("/api/v1/orders/", headers=headers)
+    assert (
+        response.status_code == 201
+    ), f"Expected status code 201, but got {response.status_code}: {response.text}"
+
+    response_data = response.json()
+    assert [item["movie_id"] for item in response_data["items"]] == [orderable.id]
+
+
+@pytest.mark.asyncio
+async def test_create_order_with_empty_cart(
+    client, db_session, seed_user_groups, jwt_manager
+):
+    """
+    Test that creating an order without a cart returns 400.
+    """
+    _, headers = await create_active_user(db_session, jwt_manager)
+
+    response = await client.post("/api/v1/orders/", headers=headers)
+    assert (
+        response.status_code == 400
+    ), f"Expected status code 400, but got {response.status_code}"
+    assert response.json()["detail"] == "Your cart is empty."
+
+
+@pytest.mark.asyncio
+async def test_pay_for_order(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that paying for an order marks it paid and moves its movies to purchased.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    result = await db_session.execute(
+        select(MovieModel).order_by(MovieModel.id.asc()).limit(2)
+    )
+    movies = result.scalars().all()
+    await fill_cart(db_session, user, movies)
+
+    response = await client.post("/api/v1/orders/", headers=headers)
+    order_id = response.json()["id"]
+
+    with patch("src.routes.orders.send_email", new_callable=AsyncMock) as send_email:
+        response = await client.post(f"/api/v1/orders/{order_id}/pay", headers=headers)
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    assert response.json()["status"] == OrderStatusEnum.PAID.value
+    send_email.assert_awaited_once()
+    assert send_email.await_args.kwargs["recipient"] == user.email
+
+    purchased = (
+        (
+            await db_session.execute(
+                select(PurchasedMovieModel).where(
+                    PurchasedMovieModel.user_id == user.id
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert {item.movie_id for item in purchased} == {movie.id for movie in movies}
+
+
+@pytest.mark.asyncio
+async def test_list_user_orders_is_paginated(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that user orders are listed with their items and respect limit/offset.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    result = await db_session.execute(
+        select(MovieModel).order_by(MovieModel.id.asc()).limit(3)
+    )
+    for movie in result.scalars().all():
+        await client.post(
+            "/api/v1/theater/cart/add", headers=headers, json={"movie_id": movie.id}
+        )
+        response = await client.post("/api/v1/orders/", headers=headers)
+        assert (
+            response.status_code == 201
+        ), f"Expected status code 201, but got {response.status_code}: {response.text}"
+
+    response = await client.get("/api/v1/orders/?limit=2", headers=headers)
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    first_page = response.json()
+    assert len(first_page) == 2
+    assert all(len(order["items"]) == 1 for order in first_page)
+
+    response = await client.get("/api/v1/orders/?limit=2&offset=2", headers=headers)
+    second_page = response.json()
+    assert len(second_page) == 1
+    assert second_page[0]["id"] not in {order["id"] for order in first_page}
+
+
+@pytest.mark.asyncio
+async def test_cancel_order(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that a pending order can be canceled once.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    movie = (await db_session.execute(select(MovieModel).limit(1))).scalars().first()
+    await fill_cart(db_session, user, [movie])
+    order_id = (await client.post("/api/v1/orders/", headers=headers)).json()["id"]
+
+    response = await client.post(f"/api/v1/orders/{order_id}/cancel", headers=headers)
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    assert response.json()["status"] == OrderStatusEnum.CANCELED.value
+    assert [item["movie_id"] for item in response.json()["items"]] == [movie.id]
+
+    response = await client.post(f"/api/v1/orders/{order_id}/cancel", headers=headers)
+    assert (
+        response.status_code == 400
+    ), f"Expected status code 400, but got {response.status_code}"
+
+
+@pytest.mark.asyncio
+async def test_admin_export_orders_streams_ndjson(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that the admin order export streams one JSON document per order.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    result = await db_session.execute(
+        select(MovieModel).order_by(MovieModel.id.asc()).limit(2)
+    )
+    for movie in result.scalars().all():
+        await client.post(
+            "/api/v1/theater/cart/add", headers=headers, json={"movie_id": movie.id}
+        )
+        await client.post("/api/v1/orders/", headers=headers)
+
+    app.dependency_overrides[get_current_admin] = lambda: user
+    response = await client.get(
+        "/api/v1/orders/admin/orders/export", params={"user_id": user.id}
+    )
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    orders = [json.loads(line) for line in response.text.splitlines()]
+    assert len(orders) == 2
+    assert all(len(order["items"]) == 1 for order in orders)
+
+
+def test_order_routes_are_registered_once():
+    """
+    Test that no order route is registered more than once on the application.
+    """
+    routes = [
+        (route.path, method)
+        for route in app.routes
+        if route.path.startswith("/api/v1/orders")
+        for method in getattr(route, "methods", ())
+    ]
+    assert routes, "Order routes should be registered."
+    assert len(routes) == len(set(routes)), "Order routes are registered twice."
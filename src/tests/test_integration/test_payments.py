@@ -0,0 +1,263 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from src.config.dependencies import get_current_admin
+from src.database import (
+    MovieModel,
+    OrderStatusEnum,
+    PaymentStatusEnum,
+    UserGroupEnum,
+    UserGroupModel,
+    UserModel,
+)
+from src.main import app
+from src.tasks.webhooks import PaymentWebhookBatcher, payment_webhook_batcher
+from src.tests.test_integration.test_orders import create_active_user, fill_cart
+
+
+async def create_pending_order(client, db_session, user, headers):
+    result = await db_session.execute(
+        select(MovieModel).order_by(MovieModel.id.asc()).limit(2)
+    )
+    await fill_cart(db_session, user, result.scalars().all())
+    response = await client.post("/api/v1/orders/", headers=headers)
+    assert (
+        response.status_code == 201
+    ), f"Expected status code 201, but got {response.status_code}: {response.text}"
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_create_payment(
+    client, db_session, seed_user_groups, jwt_manager, seed_database, email_sender_stub
+):
+    """
+    Test that paying a pending order records the payment with one item per order item.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    order = await create_pending_order(client, db_session, user, headers)
+
+    response = await client.post(
+        "/api/v1/payments/",
+        headers=headers,
+        json={"order_id": order["id"], "amount": order["total_amount"]},
+    )
+    assert (
+        response.status_code == 201
+    ), f"Expected status code 201, but got {response.status_code}: {response.text}"
+
+    response_data = response.json()
+    assert response_data["status"] == PaymentStatusEnum.SUCCESSFUL.value
+    assert response_data["created_at"] is not None
+    assert {item["order_item_id"] for item in response_data["items"]} == {
+        item["id"] for item in order["items"]
+    }
+
+    response = await client.get(f"/api/v1/orders/{order['id']}", headers=headers)
+    assert response.json()["status"] == OrderStatusEnum.PAID.value
+
+
+@pytest.mark.asyncio
+async def test_refund_payment(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that an admin can refund a successful payment.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    order = await create_pending_order(client, db_session, user, headers)
+    response = await client.post(
+        "/api/v1/payments/",
+        headers=headers,
+        json={"order_id": order["id"], "amount": order["total_amount"]},
+    )
+    payment_id = response.json()["id"]
+
+    admin_group = (
+        await db_session.execute(
+            select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.ADMIN)
+        )
+    ).scalar_one()
+    _, admin_headers = await create_active_user(
+        db_session, jwt_manager, "admin@mate.com"
+    )
+    admin = (
+        await db_session.execute(
+            select(UserModel).where(UserModel.email == "admin@mate.com")
+        )
+    ).scalar_one()
+    admin.group_id = admin_group.id
+    await db_session.commit()
+
+    response = await client.post(
+        f"/api/v1/payments/{payment_id}/refund", headers=admin_headers
+    )
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+    assert response.json()["status"] == PaymentStatusEnum.REFUNDED.value
+    assert len(response.json()["items"]) == len(order["items"])
+
+
+@pytest.mark.asyncio
+async def test_admin_export_payments_streams_ndjson(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that the admin payment export streams one JSON document per payment.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    order = await create_pending_order(client, db_session, user, headers)
+    await client.post(
+        "/api/v1/payments/",
+        headers=headers,
+        json={"order_id": order["id"], "amount": order["total_amount"]},
+    )
+
+    app.dependency_overrides[get_current_admin] = lambda: user
+    response = await client.get(
+        "/api/v1/payments/admin/payments/export",
+        params={"status": PaymentStatusEnum.SUCCESSFUL.value},
+    )
+    assert (
+        response.status_code == 200
+    ), f"Expected status code 200, but got {response.status_code}: {response.text}"
+
+    payments = [json.loads(line) for line in response.text.splitlines()]
+    assert [payment["order_id"] for payment in payments] == [order["id"]]
+    assert len(payments[0]["items"]) == len(order["items"])
+
+
+@pytest.mark.asyncio
+async def test_stripe_webhook_events_are_batched(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that webhook events are queued and applied in one batch, last event winning.
+    """
+    user, headers = await create_active_user(db_session, jwt_manager)
+    order = await create_pending_order(client, db_session, user, headers)
+    response = await client.post(
+        "/api/v1/payments/",
+        headers=headers,
+        json={
+            "order_id": order["id"],
+            "amount": order["total_amount"],
+            "external_payment_id": "pi_123",
+        },
+    )
+    payment_id = response.json()["id"]
+
+    for event_type in (
+        "payment_intent.payment_failed",
+        "payment_intent.payment_failed",
+        "payment_intent.succeeded",
+        "payment_intent.payment_failed",
+    ):
+        response = await client.post(
+            "/api/v1/payments/webhook/stripe",
+            json={"type": event_type, "data": {"object": {"id": "pi_123"}}},
+        )
+        assert response.json() == {"status": "queued"}
+
+    response = await client.get(f"/api/v1/payments/{payment_id}", headers=headers)
+    assert (
+        response.json()["status"] == PaymentStatusEnum.SUCCESSFUL.value
+    ), "Events should not be applied before the batch is flushed."
+
+    await payment_webhook_batcher.drain()
+
+    response = await client.get(f"/api/v1/payments/{payment_id}", headers=headers)
+    assert response.json()["status"] == PaymentStatusEnum.CANCELED.value
+
+
+async def create_external_payment(client, db_session, jwt_manager, external_id):
+    user, headers = await create_active_user(db_session, jwt_manager)
+    order = await create_pending_order(client, db_session, user, headers)
+    response = await client.post(
+        "/api/v1/payments/",
+        headers=headers,
+        json={
+            "order_id": order["id"],
+            "amount": order["total_amount"],
+            "external_payment_id": external_id,
+        },
+    )
+    return response.json()["id"], headers
+
+
+@pytest.mark.asyncio
+async def test_stripe_webhook_rejects_event_without_intent_id(client):
+    """
+    Test that a payment event without a payment intent id is rejected instead of queued.
+    """
+    response = await client.post(
+        "/api/v1/payments/webhook/stripe",
+        json={"type": "payment_intent.succeeded", "data": {"object": {}}},
+    )
+    assert response.status_code == 400
+    assert payment_webhook_batcher._queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_stripe_webhook_events_survive_a_failed_flush(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that a batch whose write fails is kept and applied by the next flush.
+    """
+    payment_id, headers = await create_external_payment(
+        client, db_session, jwt_manager, "pi_retry"
+    )
+    await client.post(
+        "/api/v1/payments/webhook/stripe",
+        json={
+            "type": "payment_intent.payment_failed",
+            "data": {"object": {"id": "pi_retry"}},
+        },
+    )
+
+    with patch(
+        "src.tasks.webhooks.get_db_contextmanager",
+        side_effect=OperationalError("UPDATE", {}, Exception("database is down")),
+    ):
+        await payment_webhook_batcher.drain()
+
+    response = await client.get(f"/api/v1/payments/{payment_id}", headers=headers)
+    assert response.json()["status"] == PaymentStatusEnum.SUCCESSFUL.value
+
+    await payment_webhook_batcher.drain()
+
+    response = await client.get(f"/api/v1/payments/{payment_id}", headers=headers)
+    assert (
+        response.json()["status"] == PaymentStatusEnum.CANCELED.value
+    ), "The event should be applied once the database is reachable again."
+
+
+@pytest.mark.asyncio
+async def test_webhook_worker_keeps_its_batch_when_cancelled(
+    client, db_session, seed_user_groups, jwt_manager, seed_database
+):
+    """
+    Test that events already taken by the worker are flushed by drain() after cancellation.
+    """
+    payment_id, headers = await create_external_payment(
+        client, db_session, jwt_manager, "pi_shutdown"
+    )
+    batcher = PaymentWebhookBatcher(flush_interval=60)
+    worker = asyncio.create_task(batcher.run())
+    await batcher.put("pi_shutdown", PaymentStatusEnum.CANCELED)
+    await asyncio.sleep(0.01)
+    assert batcher._queue.empty(), "The worker should be holding the event."
+
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+    await batcher.drain()
+
+    response = await client.get(f"/api/v1/payments/{payment_id}", headers=headers)
+    assert response.json()["status"] == PaymentStatusEnum.CANCELED.value
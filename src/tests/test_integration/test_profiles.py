@@ -5,15 +5,19 @@ import pytest
 from io import BytesIO
 from PIL import Image
 from sqlalchemy import select, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import UserModel, UserProfileModel
 from src.exceptions import S3FileUploadError
+from src.main import app
+from src.tests.doubles.fakes.storage import FakeS3Storage
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
 async def test_create_user_profile_with_fake_s3(
-    db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+    db_session, seed_user_groups, jwt_manager, s3_storage_fake, client
 ):
     """
     Positive test for creating a user profile.
@@ -70,6 +74,9 @@ async def test_create_user_profile_with_fake_s3(
     assert (
         avatar_key in s3_storage_fake.storage
     ), "Avatar file was not uploaded to Fake S3 Storage!"
+    assert (
+        s3_storage_fake.read(avatar_key) == img_bytes.getvalue()
+    ), "Uploaded avatar does not match the submitted file."
     expected_url = f"http://fake-s3.local/{avatar_key}"
     actual_url = await s3_storage_fake.get_file_url(avatar_key)
     assert actual_url == expected_url, "Avatar URL does not match expected URL."
@@ -169,7 +176,7 @@ async def test_create_user_profile_expired_token(client, jwt_manager):
 @pytest.mark.asyncio
 @pytest.mark.unit
 async def test_admin_creates_user_profile(
-    db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+    db_session, seed_user_groups, jwt_manager, s3_storage_fake, client
 ):
     """
     Test that an admin can create a profile for another user.
@@ -261,7 +268,7 @@ async def test_admin_creates_user_profile(
 @pytest.mark.asyncio
 @pytest.mark.unit
 async def test_user_cannot_create_another_user_profile(
-    db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+    db_session, seed_user_groups, jwt_manager, s3_storage_fake, client
 ):
     """
     Test that a regular user cannot create a profile for another user.
@@ -328,7 +335,7 @@ async def test_user_cannot_create_another_user_profile(
 @pytest.mark.asyncio
 @pytest.mark.unit
 async def test_inactive_user_cannot_create_profile(
-    db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+    db_session, seed_user_groups, jwt_manager, s3_storage_fake, client
 ):
     """
     Test that an inactive user cannot create a profile.
@@ -383,7 +390,7 @@ async def test_inactive_user_cannot_create_profile(
 @pytest.mark.asyncio
 @pytest.mark.unit
 async def test_cannot_create_profile_twice(
-    db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+    db_session, seed_user_groups, jwt_manager, s3_storage_fake, client
 ):
     """
     Test that a user cannot create a profile twice.
@@ -443,7 +450,7 @@ async def test_cannot_create_profile_twice(
 @pytest.mark.asyncio
 @pytest.mark.unit
 async def test_profile_creation_fails_on_s3_upload_error(
-    db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+    db_session, seed_user_groups, jwt_manager, s3_storage_fake, client
 ):
     """
     Test that profile creation fails if S3 upload fails.
@@ -483,7 +490,7 @@ async def test_profile_creation_fails_on_s3_upload_error(
         "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
     }
 
-    with patch.object(s3_storage_fake, "upload_file", side_effect=S3FileUploadError()):
+    with patch.object(FakeS3Storage, "upload_file", side_effect=S3FileUploadError()):
         response = await client.post(profile_url, headers=headers, files=files)
         assert response.status_code == 500, f"Expected 500, got {response.status_code}"
         assert (
@@ -497,6 +504,101 @@ async def test_profile_creation_fails_on_s3_upload_error(
     assert profile_in_db is None, "Profile should not be created when S3 upload fails!"
 
 
+@pytest.mark.asyncio
+async def test_failed_avatar_upload_drops_cached_profile(
+    db_session, seed_user_groups, jwt_manager, s3_storage_fake, redis_fake, client
+):
+    """
+    Test that a profile rolled back after a failed upload is not left in the cache.
+
+    A read racing the upload can cache the briefly committed profile; the failed
+    upload must remove that entry together with the profile.
+    """
+    user = UserModel.create(
+        email="test@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+
+    img = Image.new("RGB", (100, 100), color="blue")
+    img_bytes = BytesIO()
+    img.save(img_bytes, format="JPEG")
+    img_bytes.seek(0)
+    files = {
+        "first_name": (None, "John"),
+        "last_name": (None, "Doe"),
+        "gender": (None, "man"),
+        "date_of_birth": (None, "1990-01-01"),
+        "info": (None, "This is a test profile."),
+        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
+    }
+
+    async def upload_raced_by_a_read(file_name, file_data):
+        await redis_fake.set(f"profile:{user.id}", '{"stale": "profile"}')
+        raise S3FileUploadError()
+
+    with patch.object(FakeS3Storage, "upload_file", side_effect=upload_raced_by_a_read):
+        response = await client.post(
+            f"/api/v1/profiles/users/{user.id}/profile/",
+            headers={"Authorization": f"Bearer {access_token}"},
+            files=files,
+        )
+    assert response.status_code == 500, f"Expected 500, got {response.status_code}"
+    assert (
+        f"profile:{user.id}" not in redis_fake.storage
+    ), "The rolled back profile must not stay cached."
+
+    response = await client.get(
+        "/api/v1/profiles/me", headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert response.status_code == 404, f"Expected 404, got {response.status_code}"
+
+
+@pytest.mark.asyncio
+async def test_failed_profile_commit_deletes_uploaded_avatar(
+    db_session, seed_user_groups, jwt_manager, s3_storage_fake, client
+):
+    """
+    Test that an avatar uploaded alongside a failed profile commit is removed from S3.
+    """
+    user = UserModel.create(
+        email="test@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+
+    img = Image.new("RGB", (100, 100), color="blue")
+    img_bytes = BytesIO()
+    img.save(img_bytes, format="JPEG")
+    img_bytes.seek(0)
+    files = {
+        "first_name": (None, "John"),
+        "last_name": (None, "Doe"),
+        "gender": (None, "man"),
+        "date_of_birth": (None, "1990-01-01"),
+        "info": (None, "This is a test profile."),
+        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
+    }
+
+    commit_error = OperationalError("COMMIT", {}, Exception("database is down"))
+    with patch.object(AsyncSession, "commit", side_effect=commit_error):
+        with pytest.raises(OperationalError):
+            await client.post(
+                f"/api/v1/profiles/users/{user.id}/profile/",
+                headers={"Authorization": f"Bearer {access_token}"},
+                files=files,
+            )
+
+    avatar_key = f"avatars/{user.id}_avatar.jpg"
+    assert (
+        avatar_key not in s3_storage_fake.storage
+    ), "The avatar must not outlive the profile that failed to commit."
+
+
 @pytest.mark.asyncio
 @pytest.mark.unit
 @pytest.mark.parametrize(
@@ -697,3 +799,76 @@ async def test_profile_creation_empty_info(client, jwt_manager, info_value):
     assert "Info field cannot be empty or contain only spaces." in str(
         response.json()
     ), f"Unexpected error message: {response.json()}"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_profile_is_cached_per_user(
+    db_session, seed_user_groups, jwt_manager, redis_fake, client
+):
+    """
+    Test that profile reads are cached under a key scoped to the profile's user.
+
+    Steps:
+    1. Create an active user and a profile for them.
+    2. Read the profile via `/profiles/me` and check it is cached under `profile:{user_id}`.
+    3. Change the profile in the database and check the cached copy is served.
+    4. Check that another user's profile lookup does not see the cached profile.
+    """
+    user = UserModel.create(
+        email="test@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    other_user = UserModel.create(
+        email="other@mate.com", raw_password="TestPassword123!", group_id=1
+    )
+    user.is_active = True
+    other_user.is_active = True
+    db_session.add_all([user, other_user])
+    await db_session.flush()
+    profile = UserProfileModel(
+        user_id=user.id,
+        first_name="john",
+        last_name="doe",
+        gender="man",
+        date_of_birth=datetime(1990, 1, 1).date(),
+        info="This is a test profile.",
+        avatar="avatars/avatar.jpg",
+    )
+    db_session.add(profile)
+    await db_session.commit()
+
+    headers = {
+        "Authorization": f"Bearer {jwt_manager.create_access_token({'user_id': user.id})}"
+    }
+    response = await client.get("/api/v1/profiles/me", headers=headers)
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    assert (
+        f"profile:{user.id}" in redis_fake.storage
+    ), "Profile should be cached under the user's key."
+
+    profile.first_name = "jack"
+    await db_session.commit()
+    response = await client.get(
+        f"/api/v1/profiles/users/{user.id}/profile/", headers=headers
+    )
+    assert response.json()["first_name"] == "john", "Cached profile should be served."
+
+    response = await client.get(
+        f"/api/v1/profiles/users/{other_user.id}/profile/", headers=headers
+    )
+    assert response.status_code == 404, "Another user's profile must not be shared."
+
+
+@pytest.mark.unit
+def test_profile_routes_have_a_single_handler():
+    """
+    Test that every profile path and method is served by exactly one route.
+    """
+    registrations = [
+        (route.path, method)
+        for route in app.routes
+        if route.path.startswith("/api/v1/profiles")
+        for method in getattr(route, "methods", ())
+    ]
+    assert len(registrations) == 4, f"Unexpected profile routes: {registrations}"
+    assert len(set(registrations)) == len(registrations), "Duplicate profile routes."
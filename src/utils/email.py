@@ -1,14 +1,10 @@
+from typing import Awaitable, Callable
+
 import aiosmtplib
 from email.message import EmailMessage
 
 
-async def send_email(subject: str, recipient: str, body: str):
-    message = EmailMessage()
-    message["From"] = "noreply@example.com"
-    message["To"] = recipient
-    message["Subject"] = subject
-    message.set_content(body)
-
+async def _smtp_send(message: EmailMessage) -> None:
     await aiosmtplib.send(
         message,
         hostname="smtp.example.com",
@@ -17,3 +13,17 @@ async def send_email(subject: str, recipient: str, body: str):
         password="smtp_password",
         start_tls=True,
     )
+
+
+# Transport used by send_email; tests swap it for a no-op so no SMTP connection is opened.
+SENDER: Callable[[EmailMessage], Awaitable[None]] = _smtp_send
+
+
+async def send_email(subject: str, recipient: str, body: str):
+    message = EmailMessage()
+    message["From"] = "noreply@example.com"
+    message["To"] = recipient
+    message["Subject"] = subject
+    message.set_content(body)
+
+    await SENDER(message)